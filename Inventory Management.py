@@ -34,6 +34,7 @@ from tkinter import ttk
 from datetime import datetime, date
 from dateutil.relativedelta import relativedelta
 import pandas as pd
+import numpy as np
 from docx import Document
 import sqlite3
 from tkinter import END
@@ -68,6 +69,49 @@ from logging.handlers import RotatingFileHandler
 import time
 from docx.enum.text import WD_COLOR_INDEX
 from docx.shared import Pt
+import hashlib
+import tempfile
+import bisect
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+import json
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import multiprocessing
+from collections import OrderedDict
+
+
+SNAPSHOT_FOLDER = 'sheet_snapshots'  # Binary copies of the inventory sheet, rebuilt only when the workbook changes.
+WORKBOOK_POLL_INTERVAL_MS = 2000  # How often the workbook is checked for changes made outside the application.
+JOURNAL_FLUSH_DELAY_MS = 5000  # Idle time after the last save before journaled edits are written to the workbook.
+JOURNAL_RETRY_DELAY_MS = 30000  # Wait before retrying a flush that failed (e.g. the workbook is open in Excel).
+PRICE_KERNEL_MAX_CENTS = 10 ** 12  # Larger fair market values are priced with Decimal to stay clear of int64 overflow.
+SEARCH_DEBOUNCE_MS = 150  # Pause in typing before the search runs.
+SEARCH_FOLDER_WEIGHT = 1.0  # Relevance of a search term found in a folder name.
+SEARCH_FIELD_WEIGHTS = {  # Relevance of a search term found in each searchable sheet column.
+    'ASIN': 1.0,
+    'Product Name': 0.9,
+    'Rack ID': 0.8,
+    'Order Link': 0.5,
+    'Comments': 0.4,
+    'Product Description': 0.3,
+}
+SEARCH_SHORT_FIELDS = {'ASIN', 'Rack ID'}  # Columns that one and two character search terms look at, besides folder names.
+SEARCH_FUZZY_MIN_LENGTH = 4  # Shorter search terms are never matched fuzzily.
+SEARCH_FUZZY_THRESHOLD = 0.5  # Minimum trigram similarity for a fuzzy match.
+SEARCH_INLINE_PRODUCT_CHANGES = 200  # More changed products than this rebuild the search index off the Tk thread.
+FIRST_RUN_WORKERS = 3  # Startup tasks that can run at the same time.
+FIRST_RUN_POLL_INTERVAL_MS = 200  # How often the startup progress panel is refreshed.
+WORD_DOC_WORKERS = max(1, (os.cpu_count() or 2) - 1)  # Processes writing Word documents, one core is left for the window.
+WORD_DOC_BATCH_SIZE = 25  # Word documents written per process pool task.
+WORD_DOC_POLL_INTERVAL_MS = 200  # How often the Word document progress is refreshed.
+THUMBNAIL_FOLDER = 'thumbnails'  # Product images resized for display, named after the hash of the picture.
+THUMBNAIL_SIZE = (100, 100)  # Size of the product image in the product form.
+IMAGE_CACHE_BUDGET_BYTES = 64 * 1024 * 1024  # Memory for product images and thumbnails.
+IMAGE_WORKERS = 2  # Threads loading product images.
+PREFETCH_NEIGHBOURS = 3  # Products on each side of the selection prepared in the background.
+PREFETCH_AHEAD = 10  # Further products prepared in the direction of travel while the list is idle.
+PREFETCH_CACHE_SIZE = 64  # Prepared products kept for display.
 
 
 # Prototyping (make it work, then make it pretty.)
@@ -77,6 +121,7 @@ from docx.shared import Pt
 class DatabaseManager: #DB practice(use txt/json to store folder paths when program finished for faster reads.)
 
     def __init__(self, db_name='inventory_management.db'):
+        # A connection only works on the thread that opened it, worker threads create their own DatabaseManager
         self.conn = sqlite3.connect(db_name)
         self.cur = self.conn.cursor()
         self.setup_database()
@@ -88,13 +133,83 @@ class DatabaseManager: #DB practice(use txt/json to store folder paths when prog
                 Path TEXT
             )
         ''')
+        self.migrate_folder_paths()
+        # Mirror of the inventory sheet, keyed by the normalized Product ID. The columns used
+        # for filtering are stored separately so they can be indexed, the full row is kept as JSON.
+        self.cur.execute('''
+            CREATE TABLE IF NOT EXISTS products (
+                ProductKey TEXT PRIMARY KEY,
+                ProductID TEXT,
+                ASIN TEXT,
+                ProductName TEXT,
+                Sold TEXT,
+                Damaged TEXT,
+                Personal TEXT,
+                CancelledOrder TEXT,
+                ToSellAfter TEXT,
+                Record TEXT
+            )
+        ''')
+        self.cur.execute('CREATE INDEX IF NOT EXISTS idx_products_product_id ON products (ProductID)')
+        self.cur.execute('CREATE INDEX IF NOT EXISTS idx_products_asin ON products (ASIN)')
+        self.cur.execute('DROP INDEX IF EXISTS idx_products_to_sell_after')  # Replaced by idx_products_for_sale
+        # Partial index for get_products_to_sell, it only holds the products that can still be sold.
+        # The WHERE clause has to stay identical to the query's, which names it with INDEXED BY.
+        self.cur.execute('''
+            CREATE INDEX IF NOT EXISTS idx_products_for_sale ON products (ToSellAfter)
+            WHERE IFNULL(Sold, '') != 'YES' AND IFNULL(Damaged, '') != 'YES'
+              AND IFNULL(Personal, '') != 'YES' AND IFNULL(CancelledOrder, '') != 'YES'
+        ''')
+        # Every folder under the inventory roots with its modification time, so a refresh only 
+        # lists the folders whose contents changed. Mtime is NULL for symlinked folders, which 
+        # are listed but not descended into (like os.walk).
+        self.cur.execute('''
+            CREATE TABLE IF NOT EXISTS directory_index (
+                Path TEXT PRIMARY KEY,
+                Parent TEXT,
+                Name TEXT,
+                Root TEXT,
+                Mtime INTEGER
+            )
+        ''')
+        self.cur.execute('CREATE INDEX IF NOT EXISTS idx_directory_index_parent ON directory_index (Parent)')
+        # Fingerprint of the workbook the products table was last imported from
+        self.cur.execute('''
+            CREATE TABLE IF NOT EXISTS product_sync (
+                Source TEXT PRIMARY KEY,
+                Fingerprint TEXT
+            )
+        ''')
         self.conn.commit()
 
+    def migrate_folder_paths(self):
+        """
+        Adds the ProductKey column (the normalized Product ID a folder name starts with) to 
+        databases created before it existed, fills it in and indexes it.
+        """
+        self.cur.execute('PRAGMA table_info(folder_paths)')
+        if 'ProductKey' not in [row[1] for row in self.cur.fetchall()]:
+            self.cur.execute('ALTER TABLE folder_paths ADD COLUMN ProductKey TEXT')
+            self.cur.execute('SELECT Folder FROM folder_paths')
+            self.cur.executemany('UPDATE folder_paths SET ProductKey = ? WHERE Folder = ?',
+                                 [(self.folder_product_key(folder), folder) for folder, in self.cur.fetchall()])
+        self.cur.execute('CREATE INDEX IF NOT EXISTS idx_folder_paths_product_key ON folder_paths (ProductKey)')
+
+    @staticmethod
+    def folder_product_key(folder):
+        """
+        Returns the normalized Product ID at the start of a product folder's name ('ID - Name'),
+        or None for folders without one.
+        """
+        if ' ' not in folder:
+            return None
+        return ExcelManager.normalize_product_id(folder.split(' ', 1)[0])
+
     def save_folder_path(self, folder, path):
         self.cur.execute('''
-            INSERT INTO folder_paths (Folder, Path) VALUES (?, ?)
-            ON CONFLICT(Folder) DO UPDATE SET Path = excluded.Path;
-        ''', (folder, path))
+            INSERT INTO folder_paths (Folder, Path, ProductKey) VALUES (?, ?, ?)
+            ON CONFLICT(Folder) DO UPDATE SET Path = excluded.Path, ProductKey = excluded.ProductKey;
+        ''', (folder, path, self.folder_product_key(folder)))
         self.conn.commit()
 
     def delete_folder_path(self, old_folder_name):
@@ -112,14 +227,258 @@ class DatabaseManager: #DB practice(use txt/json to store folder paths when prog
         result = self.cur.fetchone()
         return result[0] if result else None
 
+    def get_product_folder_path(self, product_id):
+        """
+        Returns the path of the folder whose name starts with the product ID followed by a space.
+        """
+        self.cur.execute("SELECT Path FROM folder_paths WHERE ProductKey = ?", (ExcelManager.normalize_product_id(product_id),))
+        result = self.cur.fetchone()
+        return result[0] if result else None
+
+    def get_document_sources(self, product_ids):
+        """
+        Returns {normalized Product ID: (folder path, record)} for the given products that have a 
+        folder, reading the folders and records of all of them in a few indexed queries.
+        """
+        product_keys = list(dict.fromkeys(ExcelManager.normalize_product_id(product_id) for product_id in product_ids))
+        sources = {}
+        for start in range(0, len(product_keys), 500):  # Stay under SQLite's limit of query parameters
+            chunk = product_keys[start:start + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            self.cur.execute(f'''
+                SELECT folder_paths.ProductKey, folder_paths.Path, products.Record FROM folder_paths
+                LEFT JOIN products ON products.ProductKey = folder_paths.ProductKey
+                WHERE folder_paths.ProductKey IN ({placeholders})
+            ''', chunk)
+            for product_key, path, record in self.cur.fetchall():
+                if product_key not in sources:
+                    sources[product_key] = (path, self.decode_record(record) if record else None)
+        return sources
+
     def get_all_folders(self):
         self.cur.execute('SELECT Folder FROM folder_paths')
         return [row[0] for row in self.cur.fetchall()]
 
+    def get_leaf_folders(self):
+        """
+        Returns (name, path) for every indexed folder without subfolders, the folders the 
+        search looks at. Symlinked folders aren't walked into, so they never count as leaves.
+        """
+        self.cur.execute('''
+            SELECT Name, Path FROM directory_index AS folder
+            WHERE Mtime IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM directory_index AS child WHERE child.Parent = folder.Path)
+        ''')
+        return self.cur.fetchall()
+
     def delete_all_folders(self):
         self.cur.execute('DELETE FROM folder_paths')
+        self.cur.execute('DELETE FROM directory_index')  # Rescan everything so folder_paths gets refilled
         self.conn.commit()
-        
+
+    def refresh_directory_index(self, roots):
+        """
+        Brings the directory index up to date with the folders under the given roots and returns 
+        (name, path) for every folder below them. Only folders whose modification time changed are 
+        listed again, the differences are written in one transaction and new folders are saved 
+        to folder_paths.
+        """
+        self.cur.execute('SELECT Path, Parent, Name, Root, Mtime FROM directory_index')
+        indexed = {}
+        children = {}
+        for path, parent, name, root, mtime in self.cur.fetchall():
+            indexed[path] = (parent, name, root, mtime)
+            if parent is not None:
+                children.setdefault(parent, []).append(path)
+
+        current = {}  # Path -> (parent, name, root, mtime) as found on disk
+        stack = [(root, None, os.path.basename(root), root, True) for root in dict.fromkeys(roots) if root]
+        while stack:
+            path, parent, name, root, descend = stack.pop()
+            if path in current:
+                continue  # Reached through another root
+            if not descend:
+                current[path] = (parent, name, root, None)
+                continue
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue  # Gone (or unreadable), its rows are removed below
+            current[path] = (parent, name, root, mtime)
+
+            entry = indexed.get(path)
+            if entry is not None and entry[2] == root and entry[3] == mtime:
+                # Nothing was added, removed or renamed directly in this folder since the last refresh
+                for child in children.get(path, []):
+                    child_entry = indexed[child]
+                    stack.append((child, path, child_entry[1], root, child_entry[3] is not None))
+                continue
+
+            try:
+                with os.scandir(path) as entries:
+                    subfolders = [(entry.name, entry.is_symlink()) for entry in entries if entry.is_dir()]
+            except OSError:
+                subfolders = []
+            for child_name, is_symlink in subfolders:
+                stack.append((os.path.join(path, child_name), path, child_name, root, not is_symlink))
+
+        changed = [(path,) + values for path, values in current.items() if indexed.get(path) != values]
+        removed = [(path,) for path in indexed if path not in current]
+        added = [(values[1], path) for path, values in current.items() if values[0] is not None and path not in indexed]
+
+        if changed or removed:
+            try:
+                self.cur.execute('BEGIN')
+                self.cur.executemany('DELETE FROM directory_index WHERE Path = ?', removed)
+                self.cur.executemany('''
+                    INSERT OR REPLACE INTO directory_index (Path, Parent, Name, Root, Mtime) VALUES (?, ?, ?, ?, ?)
+                ''', changed)
+                self.cur.executemany('INSERT OR REPLACE INTO folder_paths (Folder, Path, ProductKey) VALUES (?, ?, ?)',
+                                     [(folder, path, self.folder_product_key(folder)) for folder, path in added])
+                self.conn.commit()
+            except Exception as e:
+                self.conn.rollback()
+                print(f"Error updating the directory index: {e}")
+
+        return [(values[1], path) for path, values in current.items() if values[0] is not None]
+
+    def sync_products(self, fingerprint, data_frame):
+        """
+        Re-imports the products table from the sheet's DataFrame when the workbook's fingerprint
+        differs from the one it was last imported from. Only the rows that changed are written.
+        Returns True if the table was re-imported.
+        """
+        fingerprint = repr(fingerprint)
+        self.cur.execute("SELECT Fingerprint FROM product_sync WHERE Source = 'sheet'")
+        result = self.cur.fetchone()
+        if result and result[0] == fingerprint:
+            return False
+
+        # Parsed the same way the products to sell report always parsed the column
+        to_sell_after = pd.to_datetime(data_frame['To Sell After'], errors='coerce') if 'To Sell After' in data_frame.columns else None
+        rows = {}
+        for position, record in enumerate(data_frame.to_dict('records')):
+            sell_date = to_sell_after.iat[position] if to_sell_after is not None else None
+            row = self.product_row(record, sell_date)
+            # Rows without a Product ID can't be looked up and duplicates keep their first row, like the sheet index
+            if row[0] and row[0] not in rows:
+                rows[row[0]] = row
+
+        self.cur.execute('''
+            SELECT ProductKey, ProductID, ASIN, ProductName, Sold, Damaged,
+                   Personal, CancelledOrder, ToSellAfter, Record
+            FROM products
+        ''')
+        stored = {row[0]: row for row in self.cur.fetchall()}
+        self.cur.executemany('DELETE FROM products WHERE ProductKey = ?',
+                             [(product_key,) for product_key in stored if product_key not in rows])
+        self.cur.executemany('''
+            INSERT OR REPLACE INTO products (ProductKey, ProductID, ASIN, ProductName, Sold, Damaged,
+                                             Personal, CancelledOrder, ToSellAfter, Record)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [row for product_key, row in rows.items() if stored.get(product_key) != row])
+        self.cur.execute('''
+            INSERT INTO product_sync (Source, Fingerprint) VALUES ('sheet', ?)
+            ON CONFLICT(Source) DO UPDATE SET Fingerprint = excluded.Fingerprint;
+        ''', (fingerprint,))
+        self.conn.commit()
+        return True
+
+    def save_product(self, record):
+        """
+        Replaces a single product's row, e.g. after it was edited in the form.
+        """
+        self.cur.execute('''
+            INSERT OR REPLACE INTO products (ProductKey, ProductID, ASIN, ProductName, Sold, Damaged,
+                                             Personal, CancelledOrder, ToSellAfter, Record)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', self.product_row(record, pd.to_datetime(record.get('To Sell After'), errors='coerce')))
+        self.conn.commit()
+
+    def get_product_info(self, product_id):
+        """
+        Returns a product's full row as a dictionary keyed by the sheet's headers, or None.
+        """
+        self.cur.execute('SELECT Record FROM products WHERE ProductKey = ?', (ExcelManager.normalize_product_id(product_id),))
+        result = self.cur.fetchone()
+        return self.decode_record(result[0]) if result else None
+
+    def get_product_names(self):
+        """
+        Returns (Product ID, Product Name) pairs for every product, sorted by Product ID.
+        """
+        self.cur.execute('SELECT ProductID, ProductName FROM products ORDER BY ProductID')
+        return self.cur.fetchall()
+
+    def get_products_to_sell(self, as_of):
+        """
+        Returns the records of products that aren't sold, damaged, personal or a cancelled order
+        and whose 'To Sell After' date is on or before the given date.
+        """
+        # Otherwise SQLite prefers walking every row through the ProductID index for the ORDER BY
+        self.cur.execute('''
+            SELECT Record FROM products INDEXED BY idx_products_for_sale
+            WHERE ToSellAfter <= ?
+              AND IFNULL(Sold, '') != 'YES' AND IFNULL(Damaged, '') != 'YES'
+              AND IFNULL(Personal, '') != 'YES' AND IFNULL(CancelledOrder, '') != 'YES'
+            ORDER BY ProductID
+        ''', (as_of.isoformat(),))
+        return [self.decode_record(row[0]) for row in self.cur.fetchall()]
+
+    @classmethod
+    def product_row(cls, record, to_sell_after):
+        """
+        Builds the products table row for a sheet record. to_sell_after is the parsed
+        'To Sell After' date (NaT or None when it's missing or invalid).
+        """
+        def text(column):
+            value = record.get(column)
+            return None if value is None or pd.isnull(value) else str(value)
+
+        product_id = text('Product ID')
+        return (
+            ExcelManager.normalize_product_id(product_id) if product_id else None,
+            product_id,
+            text('ASIN'),
+            text('Product Name'),
+            text('Sold'),
+            text('Damaged'),
+            text('Personal'),
+            text('Cancelled Order'),
+            None if to_sell_after is None or pd.isnull(to_sell_after) else to_sell_after.date().isoformat(),
+            cls.encode_record(record),
+        )
+
+    @staticmethod
+    def encode_record(record):
+        """
+        Serializes a sheet record to JSON. Empty cells become null and dates are tagged,
+        so they come back as datetime objects like pandas returns them.
+        """
+        def encode_value(value):
+            if value is None or (not isinstance(value, str) and pd.api.types.is_scalar(value) and pd.isnull(value)):
+                return None
+            if isinstance(value, datetime):
+                return {'$datetime': value.isoformat()}
+            if hasattr(value, 'item'):  # numpy scalars
+                value = value.item()
+            if isinstance(value, (bool, int, float, str)):
+                return value
+            return str(value)
+
+        return json.dumps({str(key): encode_value(value) for key, value in record.items()})
+
+    @staticmethod
+    def decode_record(record_json):
+        """
+        Reverses encode_record.
+        """
+        record = json.loads(record_json)
+        for key, value in record.items():
+            if isinstance(value, dict) and '$datetime' in value:
+                record[key] = datetime.fromisoformat(value['$datetime'])
+        return record
+
     def commit_changes(self):
         self.conn.commit()
         
@@ -127,89 +486,1189 @@ class DatabaseManager: #DB practice(use txt/json to store folder paths when prog
         if hasattr(self, 'conn'):
             self.conn.close()
 
+class EditJournal:
+    """
+    Durable journal of product edits that haven't been written to the workbook yet. 
+    Every call opens its own connection, so the journal can be used from the Tk thread 
+    and from the thread that flushes it to the workbook.
+    """
+
+    def __init__(self, db_name='inventory_management.db'):
+        self.db_name = db_name
+        self.setup_journal()
+
+    def connect(self):
+        return sqlite3.connect(self.db_name, timeout=30)
+
+    def setup_journal(self):
+        conn = self.connect()
+        try:
+            with conn:
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS pending_edits (
+                        Id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        ProductID TEXT,
+                        ColumnName TEXT,
+                        Value TEXT
+                    )
+                ''')
+        finally:
+            conn.close()
+
+    def append(self, product_id, product_data):
+        """
+        Records the edits of one product. The edits are committed before this returns.
+        """
+        rows = [(product_id, key, json.dumps(value, default=str)) for key, value in product_data.items()]
+        conn = self.connect()
+        try:
+            with conn:
+                conn.executemany('INSERT INTO pending_edits (ProductID, ColumnName, Value) VALUES (?, ?, ?)', rows)
+        finally:
+            conn.close()
+
+    def pending(self):
+        """
+        Returns the id of the newest journaled edit and the pending edits coalesced per product, 
+        as a dict of product ID -> {column header: value}. Later edits of a cell replace earlier ones.
+        """
+        conn = self.connect()
+        try:
+            rows = conn.execute('SELECT Id, ProductID, ColumnName, Value FROM pending_edits ORDER BY Id').fetchall()
+        finally:
+            conn.close()
+
+        last_id = None
+        edits = {}
+        for edit_id, product_id, column_name, value in rows:
+            edits.setdefault(product_id, {})[column_name] = json.loads(value)
+            last_id = edit_id
+        return last_id, edits
+
+    def has_pending(self):
+        conn = self.connect()
+        try:
+            return conn.execute('SELECT 1 FROM pending_edits LIMIT 1').fetchone() is not None
+        finally:
+            conn.close()
+
+    def discard_through(self, last_id):
+        """
+        Removes the edits up to and including last_id once they have been written to the workbook.
+        """
+        conn = self.connect()
+        try:
+            with conn:
+                conn.execute('DELETE FROM pending_edits WHERE Id <= ?', (last_id,))
+        finally:
+            conn.close()
+
+class LRUByteCache:
+    """
+    Thread-safe least recently used cache with a budget in bytes. Every entry is stored with 
+    its size; adding an entry evicts the least recently used ones until the total fits the 
+    budget again. Entries larger than the whole budget are not cached.
+    """
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()  # Key -> (value, size), least recently used first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size):
+        with self.lock:
+            self.discard_entry(key)
+            if size > self.budget_bytes:
+                return
+            self.entries[key] = (value, size)
+            self.total_bytes += size
+            while self.total_bytes > self.budget_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+
+    def discard(self, key):
+        with self.lock:
+            self.discard_entry(key)
+
+    def discard_entry(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.entries), 'bytes': self.total_bytes, 'budget': self.budget_bytes,
+                    'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+class ThumbnailStore:
+    """
+    On-disk store of product image thumbnails, already resized for display. The PNG files are 
+    named after the hash of the original picture, so a picture keeps its thumbnail across 
+    workbook saves. A table maps (workbook fingerprint, row, column) to the file to show. 
+    Every call opens its own connection, so the store can be used from image loading threads.
+    """
+
+    def __init__(self, db_name='inventory_management.db', folder=THUMBNAIL_FOLDER):
+        self.db_name = db_name
+        self.folder = folder
+        self.files_lock = threading.Lock()  # Files are only removed while it's held
+        self.setup_store()
+
+    def connect(self):
+        return sqlite3.connect(self.db_name, timeout=30)
+
+    def setup_store(self):
+        conn = self.connect()
+        try:
+            with conn:
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS thumbnails (
+                        Source TEXT,
+                        Fingerprint TEXT,
+                        Row INTEGER,
+                        Col INTEGER,
+                        Digest TEXT,
+                        PRIMARY KEY (Fingerprint, Row, Col)
+                    )
+                ''')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_thumbnails_source ON thumbnails (Source)')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_thumbnails_digest ON thumbnails (Digest)')
+        finally:
+            conn.close()
+
+    @staticmethod
+    def source_key(fingerprint):
+        return f"{fingerprint[0]}|{fingerprint[3]}"
+
+    def thumbnail_path(self, digest):
+        return os.path.join(self.folder, f"{digest}.png")
+
+    def lookup(self, fingerprint, row, col):
+        """
+        Returns the thumbnail file of the picture at (row, col) in this state of the workbook, 
+        or None if it hasn't been stored yet.
+        """
+        conn = self.connect()
+        try:
+            result = conn.execute('SELECT Digest FROM thumbnails WHERE Fingerprint = ? AND Row = ? AND Col = ?',
+                                  (repr(fingerprint), row, col)).fetchone()
+        finally:
+            conn.close()
+        if result is None:
+            return None
+        path = self.thumbnail_path(result[0])
+        return path if os.path.exists(path) else None
+
+    def store(self, fingerprint, row, col, image_data):
+        """
+        Saves the thumbnail of a picture read from the workbook, unless a thumbnail of the same 
+        picture exists, and records it for (row, col). Entries of older states of the same 
+        workbook are dropped, and so are their files unless another entry still uses them.
+        """
+        digest = hashlib.sha1(image_data).hexdigest()
+        path = self.thumbnail_path(digest)
+
+        # The entry is recorded first, so the file can't be removed as unused once it's written
+        conn = self.connect()
+        try:
+            with conn:
+                stale_digests = {result[0] for result in conn.execute(
+                    'SELECT DISTINCT Digest FROM thumbnails WHERE Source = ? AND Fingerprint != ?',
+                    (self.source_key(fingerprint), repr(fingerprint)))}
+                conn.execute('DELETE FROM thumbnails WHERE Source = ? AND Fingerprint != ?',
+                             (self.source_key(fingerprint), repr(fingerprint)))
+                conn.execute('INSERT OR REPLACE INTO thumbnails (Source, Fingerprint, Row, Col, Digest) VALUES (?, ?, ?, ?, ?)',
+                             (self.source_key(fingerprint), repr(fingerprint), row, col, digest))
+        finally:
+            conn.close()
+
+        with self.files_lock:
+            exists = os.path.exists(path)
+        if not exists:
+            os.makedirs(self.folder, exist_ok=True)
+            thumbnail = self.make_thumbnail(image_data)
+            # Every writer gets its own temporary file, threads storing the same picture just replace each other's
+            handle, temp_path = tempfile.mkstemp(suffix='.tmp', dir=self.folder)
+            try:
+                with os.fdopen(handle, 'wb') as temp_file:
+                    thumbnail.save(temp_file, format='PNG')
+                os.replace(temp_path, path)
+            except Exception:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+        self.remove_unused(stale_digests - {digest})
+        return path
+
+    def remove_unused(self, digests):
+        """
+        Deletes the thumbnail files of the given digests that no entry refers to any more.
+        """
+        if not digests:
+            return
+        conn = self.connect()
+        try:
+            with self.files_lock:
+                for digest in digests:
+                    if conn.execute('SELECT 1 FROM thumbnails WHERE Digest = ? LIMIT 1', (digest,)).fetchone() is None:
+                        try:
+                            os.remove(self.thumbnail_path(digest))
+                        except FileNotFoundError:
+                            pass
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_thumbnail(image_data):
+        """
+        Decodes a picture at reduced resolution and resizes it to THUMBNAIL_SIZE. JPEG photos are 
+        decoded at the smallest DCT scale that still covers the thumbnail, other formats are 
+        shrunk by an integer factor before the final resize. The result is RGB or RGBA, so it can 
+        be saved as PNG and shown without another conversion.
+        """
+        with io.BytesIO(image_data) as image_stream:
+            image = Image.open(image_stream)
+            if image.format == 'JPEG':
+                image.draft(image.mode, THUMBNAIL_SIZE)
+            image.load()
+            if image.mode not in ('RGB', 'RGBA'):
+                has_alpha = image.mode in ('LA', 'PA') or 'transparency' in image.info
+                image = image.convert('RGBA' if has_alpha else 'RGB')  # Also CMYK photos, which PNG can't hold
+            factor = min(image.width // THUMBNAIL_SIZE[0], image.height // THUMBNAIL_SIZE[1])
+            if factor >= 2:
+                image = image.reduce(factor)
+            return image.resize(THUMBNAIL_SIZE)
+
+    @staticmethod
+    def open(path):
+        with Image.open(path) as thumbnail:
+            thumbnail.load()
+            return thumbnail.copy()
+
+class XlsxImageReader:
+    """
+    Reads the pictures embedded in a sheet straight from the xlsx package. Only the workbook, 
+    the relationship parts and the sheet's drawings are parsed, to map the cell each picture is 
+    anchored to (0-based row and column, like openpyxl) to its media part. Reading a picture 
+    then decompresses that one entry, without parsing the workbook.
+    """
+
+    NAMESPACES = {
+        'main': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
+        'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+        'rel': 'http://schemas.openxmlformats.org/package/2006/relationships',
+        'xdr': 'http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing',
+        'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    }
+    ANCHOR_TAGS = {'{http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing}twoCellAnchor',
+                   '{http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing}oneCellAnchor'}
+
+    def __init__(self, filepath, sheet_name):
+        self.filepath = filepath
+        self.sheet_name = sheet_name
+        with zipfile.ZipFile(filepath) as package:
+            self.image_parts = self.build_image_map(package)  # (row, col) -> media part
+
+    @staticmethod
+    def part_path(base_part, target):
+        """
+        Resolves a relationship target against the part the relationship belongs to.
+        """
+        if target.startswith('/'):
+            return target[1:]
+        return posixpath.normpath(posixpath.join(posixpath.dirname(base_part), target))
+
+    @classmethod
+    def relationships(cls, package, part):
+        """
+        Returns {relationship id: (relationship type, target part)} of a part ('' for the package).
+        """
+        rels_part = posixpath.join(posixpath.dirname(part), '_rels', posixpath.basename(part) + '.rels')
+        if rels_part not in package.NameToInfo:
+            return {}
+        root = ET.fromstring(package.read(rels_part))
+        return {rel.get('Id'): (rel.get('Type', ''), cls.part_path(part, rel.get('Target', '')))
+                for rel in root.iterfind('rel:Relationship', cls.NAMESPACES) if rel.get('TargetMode') != 'External'}
+
+    def build_image_map(self, package):
+        ns = self.NAMESPACES
+        workbook_part = next(target for rel_type, target in self.relationships(package, '').values()
+                             if rel_type.endswith('/officeDocument'))
+        workbook_rels = self.relationships(package, workbook_part)
+        for sheet in ET.fromstring(package.read(workbook_part)).iterfind('main:sheets/main:sheet', ns):
+            if sheet.get('name') == self.sheet_name:
+                sheet_part = workbook_rels[sheet.get(f"{{{ns['r']}}}id")][1]
+                break
+        else:
+            raise KeyError(f"Sheet '{self.sheet_name}' not found in {self.filepath}")
+
+        image_parts = {}
+        for rel_type, drawing_part in self.relationships(package, sheet_part).values():
+            if not rel_type.endswith('/drawing'):
+                continue
+            drawing_rels = self.relationships(package, drawing_part)
+            for anchor in ET.fromstring(package.read(drawing_part)).iter():
+                if anchor.tag not in self.ANCHOR_TAGS:
+                    continue
+                cell = anchor.find('xdr:from', ns)
+                blip = anchor.find('.//xdr:pic/xdr:blipFill/a:blip', ns)
+                if cell is None or blip is None or blip.get(f"{{{ns['r']}}}embed") not in drawing_rels:
+                    continue
+                key = (int(cell.findtext('xdr:row', '0', ns)), int(cell.findtext('xdr:col', '0', ns)))
+                image_parts.setdefault(key, drawing_rels[blip.get(f"{{{ns['r']}}}embed")][1])  # First picture wins, like the sheet scan
+        return image_parts
+
+    def read(self, row, col):
+        """
+        Returns the bytes of the picture anchored at (row, col), or None if there is none.
+        """
+        part = self.image_parts.get((row, col))
+        if part is None:
+            return None
+        # The package is opened per read so the file isn't held open while Excel saves it
+        with zipfile.ZipFile(self.filepath) as package:
+            return package.read(part)
+
 class ExcelManager:
 
     def __init__(self, filepath=None, sheet_name=None):
         self.filepath = filepath
         self.sheet_name = sheet_name
         self.data_frame = None
+        self.loaded_fingerprint = None  # Fingerprint of the workbook state held in data_frame
+        self.product_index = {}  # Normalized Product ID -> row position in data_frame
+        self.workbook_lock = threading.Lock()  # Serializes writes to the workbook
+        self.sheet_layouts = {}  # (workbook path, sheet name) -> header columns and Product ID rows of the sheet
+        self.logger = logging.getLogger('InventoryManagementLogger')
+
+    def workbook_fingerprint(self):
+        """
+        Returns a tuple identifying the current state of the sheet (workbook path, size, 
+        modification time and sheet name), or None if the workbook can't be found.
+        """
+        try:
+            stat = os.stat(self.filepath)
+        except OSError:
+            return None
+        return (os.path.abspath(self.filepath), stat.st_size, stat.st_mtime_ns, self.sheet_name)
+
+    @staticmethod
+    def snapshot_path(fingerprint):
+        """
+        Builds the snapshot file path for a fingerprint. The first part of the name identifies 
+        the workbook and sheet, the second part identifies the state of the workbook.
+        """
+        source_key = hashlib.sha1(f"{fingerprint[0]}|{fingerprint[3]}".encode('utf-8')).hexdigest()[:16]
+        state_key = hashlib.sha1(repr(fingerprint).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(SNAPSHOT_FOLDER, f"{source_key}-{state_key}.pkl")
 
     def load_data(self):
         if self.filepath and self.sheet_name:
-            self.data_frame = pd.read_excel(self.filepath, sheet_name=self.sheet_name, engine='openpyxl')
-            # Cast all columns to object dtype after loading data
-            self.data_frame = self.data_frame.astype('object')
+            fingerprint = self.workbook_fingerprint()
+            if fingerprint is not None and fingerprint == self.loaded_fingerprint and self.data_frame is not None:
+                return  # The data in memory already matches the workbook
+            data_frame = self.read_sheet(fingerprint)
+            self.swap_data(fingerprint, data_frame, self.build_product_index(data_frame))
+
+    def ensure_data_loaded(self):
+        """
+        Loads the sheet only when no data for the current workbook and sheet is in memory. 
+        Later changes to the workbook are picked up by the application's workbook watcher.
+        """
+        if self.data_frame is None or not self.is_current_source(self.loaded_fingerprint):
+            self.load_data()
+
+    def is_current_source(self, fingerprint):
+        """
+        Checks whether a fingerprint belongs to the workbook and sheet currently selected.
+        """
+        return (fingerprint is not None and bool(self.filepath)
+                and fingerprint[0] == os.path.abspath(self.filepath) and fingerprint[3] == self.sheet_name)
+
+    def has_source_changed(self):
+        """
+        Returns True when the workbook on disk no longer matches the data in memory.
+        Only the file's size and modification time are checked, so this is cheap to poll.
+        """
+        if not (self.filepath and self.sheet_name) or self.data_frame is None:
+            return False
+        fingerprint = self.workbook_fingerprint()
+        return fingerprint is not None and fingerprint != self.loaded_fingerprint
+
+    def swap_data(self, fingerprint, data_frame, product_index):
+        """
+        Replaces the data in memory with a newly read state of the sheet in a single assignment, 
+        so the DataFrame and its index are never seen out of step.
+        """
+        self.data_frame, self.product_index, self.loaded_fingerprint = data_frame, product_index, fingerprint
+
+    def read_sheet(self, fingerprint):
+        """
+        Reads the sheet into a DataFrame. The binary snapshot is used when one exists for the 
+        current state of the workbook, otherwise the .xlsx is parsed and a new snapshot is saved.
+        """
+        snapshot_path = self.snapshot_path(fingerprint) if fingerprint else None
+        if snapshot_path and os.path.exists(snapshot_path):
+            try:
+                return pd.read_pickle(snapshot_path)
+            except Exception as e:
+                self.logger.error(f"Unable to read sheet snapshot {snapshot_path}, rebuilding it: {e}")
+
+        data_frame = pd.read_excel(self.filepath, sheet_name=self.sheet_name, engine='openpyxl')
+        # Cast all columns to object dtype after loading data
+        data_frame = data_frame.astype('object')
+
+        # Only keep the snapshot if the workbook didn't change while it was being read
+        if snapshot_path and self.workbook_fingerprint() == fingerprint:
+            self.save_snapshot(data_frame, snapshot_path)
+        return data_frame
+
+    def save_snapshot(self, data_frame, snapshot_path):
+        """
+        Writes the snapshot atomically and removes snapshots of older states of the same sheet.
+        """
+        try:
+            os.makedirs(SNAPSHOT_FOLDER, exist_ok=True)
+            temp_path = snapshot_path + '.tmp'
+            data_frame.to_pickle(temp_path)
+            os.replace(temp_path, snapshot_path)
+
+            snapshot_name = os.path.basename(snapshot_path)
+            source_prefix = snapshot_name.split('-')[0] + '-'
+            for name in os.listdir(SNAPSHOT_FOLDER):
+                if name.startswith(source_prefix) and name != snapshot_name:
+                    os.remove(os.path.join(SNAPSHOT_FOLDER, name))
+            self.logger.info(f"Sheet snapshot saved at {snapshot_path}")
+        except Exception as e:
+            self.logger.error(f"Unable to save sheet snapshot {snapshot_path}: {e}")
+
+    @staticmethod
+    def normalize_product_id(product_id):
+        """
+        Normalizes a product ID for case-insensitive lookups.
+        """
+        return str(product_id).strip().upper()
+
+    @classmethod
+    def build_product_index(cls, data_frame):
+        """
+        Maps each normalized Product ID to the position of its first row in the DataFrame.
+        """
+        product_index = {}
+        if 'Product ID' in data_frame.columns:
+            for position, product_id in enumerate(data_frame['Product ID']):
+                if isinstance(product_id, str):
+                    product_index.setdefault(cls.normalize_product_id(product_id), position)
+        return product_index
+
+    def get_row_position(self, product_id):
+        """
+        Returns the position of the product's row in the DataFrame, or None if it isn't in the sheet.
+        """
+        if self.data_frame is None or product_id is None:
+            return None
+        return self.product_index.get(self.normalize_product_id(product_id))
 
     def get_product_info(self, product_id):
-        if self.data_frame is not None:
-            # Convert both the product_id and the 'Product ID' column to upper case for comparison
-            query_result = self.data_frame[self.data_frame['Product ID'].str.upper() == product_id.upper()]
-            if not query_result.empty:
-                return query_result.iloc[0].to_dict()
+        position = self.get_row_position(product_id)
+        if position is not None:
+            return self.data_frame.iloc[position].to_dict()
         return None
 
-    def save_product_info(self, product_id, product_data):
-        if self.filepath:
-            try:
-                #print(f"Loading workbook from {self.filepath}")
+    def apply_product_edits(self, edits):
+        """
+        Writes the edits of one or more products to the workbook in a single load/save cycle. 
+        edits maps each product ID to a dict of column header -> new value.
+        """
+        if self.filepath and edits:
+            with self.workbook_lock:
                 workbook = load_workbook(self.filepath)
-                #print(f"Accessing sheet {self.sheet_name}")
                 sheet = workbook[self.sheet_name]
 
-                # Start by finding the column index for product IDs
-                product_id_col_index = self.get_column_index_by_header(sheet, 'Product ID')
-                if not product_id_col_index:
-                    #print("Product ID column not found")
+                # Header columns and product rows come from the cached sheet layout
+                layout = self.get_sheet_layout(sheet, self.filepath)
+                if not layout['columns'].get('Product ID'):
+                    self.logger.error("Product ID column not found, edits were not saved")
                     return
 
-                # Update product_data dictionary to convert boolean to YES/NO strings
-                for key, value in product_data.items():
-                    if isinstance(value, bool):
-                        product_data[key] = 'YES' if value else 'NO'
-
-                # Now iterate over the rows to find the matching product ID
-                for row in sheet.iter_rows(min_col=product_id_col_index, max_col=product_id_col_index):
-                    cell = row[0]
-                    if cell.value and str(cell.value).strip().upper() == product_id.upper():
-                        row_num = cell.row
-                        for key, value in product_data.items():
-                            col_index = self.get_column_index_by_header(sheet, key)
-                            if col_index:
-                                # Special handling for 'To Sell After' date
-                                if key == 'To Sell After' and isinstance(value, datetime):
-                                    value = value.strftime('%m/%d/%Y')  # Format the date
-                                    sheet.cell(row=row_num, column=col_index, value=value)
-                                elif key == 'Fair Market Value':
-                                    # Convert value to float if it's not None or empty
-                                    value = float(value) if value else 0
-                                    # Set the cell value
-                                    cell = sheet.cell(row=row_num, column=col_index, value=value)
-                                    # Set the number format for currency
-                                    cell.number_format = '"$"#,##0.00'
-                                else:
-                                    sheet.cell(row=row_num, column=col_index, value=value)
-                        workbook.save(self.filepath)
-                        break
+                pending = {}
+                for product_id, product_data in edits.items():
+                    row_num = self.find_product_row(sheet, layout, product_id)
+                    if row_num is None:
+                        pending[product_id] = product_data
+                        continue
+                    for key, value in product_data.items():
+                        col_index = layout['columns'].get(key)
+                        if col_index:
+                            target_cell = sheet.cell(row=row_num, column=col_index, value=self.convert_edit_value(key, value))
+                            if key == 'Fair Market Value':
+                                # Set the number format for currency
+                                target_cell.number_format = '"$"#,##0.00'
+
+                for product_id in pending:
+                    self.logger.error(f"Product ID {product_id} not found in the sheet, its edits were not saved")
+
+                if len(pending) < len(edits):
+                    workbook.save(self.filepath)
+
+    def get_sheet_layout(self, sheet, workbook_path, rebuild=False):
+        """
+        Returns the cached layout of a sheet: 'columns' maps header names to column numbers and 
+        'rows' maps normalized Product IDs to sheet row numbers. The cache is checked against the 
+        header row and the row count of the sheet and is rebuilt when either of them changed.
+        """
+        key = (os.path.abspath(workbook_path), sheet.title)
+        headers = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        layout = self.sheet_layouts.get(key)
+        if not rebuild and layout and layout['headers'] == headers and layout['max_row'] == sheet.max_row:
+            return layout
+
+        columns = {}
+        for col_index, header in enumerate(headers, start=1):
+            if header is not None:
+                columns.setdefault(header, col_index)
+
+        rows = {}
+        product_id_col_index = columns.get('Product ID')
+        if product_id_col_index:
+            for row_num, (value,) in enumerate(sheet.iter_rows(min_row=2, min_col=product_id_col_index, max_col=product_id_col_index, values_only=True), start=2):
+                if value:
+                    rows.setdefault(self.normalize_product_id(value), row_num)
+
+        layout = {'workbook_path': workbook_path, 'headers': headers, 'max_row': sheet.max_row, 'columns': columns, 'rows': rows}
+        self.sheet_layouts[key] = layout
+        return layout
+
+    def find_product_row(self, sheet, layout, product_id):
+        """
+        Returns the sheet row of a product from the cached layout. The Product ID in that row 
+        is checked, and the layout is rebuilt if rows were moved around since it was cached.
+        """
+        product_id = self.normalize_product_id(product_id)
+        product_id_col_index = layout['columns'].get('Product ID')
+        row_num = layout['rows'].get(product_id)
+        if row_num and self.normalize_product_id(sheet.cell(row=row_num, column=product_id_col_index).value) == product_id:
+            return row_num
+
+        layout.update(self.get_sheet_layout(sheet, layout['workbook_path'], rebuild=True))
+        return layout['rows'].get(product_id)
+
+    @staticmethod
+    def convert_edit_value(key, value):
+        """
+        Converts a value from the product form to what is stored in the sheet.
+        """
+        if isinstance(value, bool):
+            return 'YES' if value else 'NO'
+        if key == 'To Sell After' and isinstance(value, datetime):
+            return value.strftime('%m/%d/%Y')  # Format the date
+        if key == 'Fair Market Value':
+            # Convert value to float if it's not None or empty
+            return float(value) if value else 0
+        return value
+
+    def update_cached_product(self, product_id, product_data):
+        """
+        Applies a product's edits to the data in memory, so they show up before they are 
+        written to the workbook.
+        """
+        position = self.get_row_position(product_id)
+        if position is None:
+            return
+        for key, value in product_data.items():
+            if key in self.data_frame.columns:
+                self.data_frame.iat[position, self.data_frame.columns.get_loc(key)] = self.convert_edit_value(key, value)
+
+    @staticmethod
+    def iter_sheet_columns(filepath, sheet_name, column_names):
+        """
+        Streams the values of the given columns from a workbook opened in read-only mode, 
+        yielding one tuple per data row in the order of column_names. Columns can be given 
+        by header name or by 0-based position. If sheet_name is None the active sheet is read.
+        Only one row is held in memory at a time.
+        """
+        workbook = load_workbook(filepath, read_only=True, data_only=True)
+        try:
+            sheet = workbook[sheet_name] if sheet_name else workbook.active
+            rows = sheet.iter_rows(values_only=True)
+            headers = next(rows, None) or ()
+
+            positions = []
+            for column_name in column_names:
+                if isinstance(column_name, int):
+                    positions.append(column_name)
+                elif column_name in headers:
+                    positions.append(headers.index(column_name))
                 else:
-                    #print(f"Product ID {product_id} not found in the sheet.")
-                    pass
-            except Exception as e:
-                #print(f"Failed to save changes to Excel file: {e}")
-                raise
+                    raise KeyError(f"Column '{column_name}' not found in sheet '{sheet.title}'")
+
+            for row in rows:
+                yield tuple(row[position] if position < len(row) else None for position in positions)
+        finally:
+            workbook.close()
+
+class FolderSearchIndex:
+    """
+    In-memory inverted index for the as-you-type search. Each document is a leaf folder, indexed 
+    by its name and by the searchable sheet columns of the product whose ID the name starts with. 
+    Everything is split into whitespace tokens, and the token vocabulary is indexed by its character 
+    grams, so a search term is matched against the few tokens sharing its grams instead of every 
+    document. Tokens that only appear in long text columns get 3 character grams only, so one and 
+    two character terms stick to folder names and IDs.
+    """
+
+    def __init__(self, sort_key):
+        self.sort_key = sort_key  # Orders ties in the results, FolderOrder.key so the keys are cached once
+        self.document_tokens = {}  # Folder name -> {token: weight of the best field it appears in}
+        self.documents_by_product = {}  # Normalized Product ID -> folder names
+        self.product_fields = {}  # Normalized Product ID -> {column: text}
+        self.token_postings = {}  # Token -> {folder name: weight}
+        self.gram_postings = {}  # Gram -> tokens containing it
+        self.short_gram_tokens = set()  # Tokens indexed by their 1 and 2 character grams too
+        self.trigram_counts = {}  # Token -> number of distinct trigrams, for fuzzy matching
 
     @staticmethod
-    def get_column_index_by_header(sheet, header_name):
+    def tokenize(text):
+        return set(str(text).upper().split())
+
+    @staticmethod
+    def grams(text, size):
+        return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+    def update(self, names):
+        """
+        Makes the index hold exactly the given folder names, only adding and removing the differences.
+        """
+        names = set(names)
+        for name in set(self.document_tokens) - names:
+            self.remove(name)
+        for name in names - set(self.document_tokens):
+            self.add(name)
+
+    def set_products(self, product_fields):
         """
-        Gets the column index based on the header name.
-        :param sheet: The sheet to search in.
-        :param header_name: The header name to find.
-        :return: The index of the column, or None if not found.
+        Replaces the searchable column values of every product ({Product ID: {column: value}}), 
+        re-indexing only the folders of products whose values changed.
         """
-        for col in sheet.iter_rows(min_row=1, max_row=1, values_only=True):
-            if header_name in col:
-                return col.index(header_name) + 1
+        for product_key, fields in self.product_changes(product_fields).items():
+            self.apply_product(product_key, fields)
+
+    def product_changes(self, product_fields):
+        """
+        Returns {Product ID: searchable values} for the products whose values differ from the 
+        indexed ones. Products that are no longer listed map to an empty dict.
+        """
+        changes = {product_key: {} for product_key in set(self.product_fields) - set(product_fields)}
+        for product_key, fields in product_fields.items():
+            fields = self.searchable_fields(fields)
+            if self.product_fields.get(product_key, {}) != fields:
+                changes[product_key] = fields
+        return changes
+
+    @staticmethod
+    def searchable_fields(fields):
+        return {column: str(value) for column, value in (fields or {}).items()
+                if column in SEARCH_FIELD_WEIGHTS and value is not None and not pd.isnull(value) and str(value).strip()}
+
+    def set_product(self, product_key, fields):
+        """
+        Updates one product's searchable column values, e.g. after it was edited in the form.
+        """
+        fields = self.searchable_fields(fields)
+        if self.product_fields.get(product_key, {}) != fields:
+            self.apply_product(product_key, fields)
+
+    def apply_product(self, product_key, fields):
+        if fields:
+            self.product_fields[product_key] = fields
+        else:
+            self.product_fields.pop(product_key, None)
+        for name in list(self.documents_by_product.get(product_key, ())):
+            self.remove(name)
+            self.add(name)
+
+    def add(self, name):
+        # Folder name tokens weigh the most, then the product's columns by their weight
+        tokens = dict.fromkeys(self.tokenize(name), SEARCH_FOLDER_WEIGHT)
+        short_tokens = set(tokens)
+        product_key = DatabaseManager.folder_product_key(name)
+        if product_key:
+            self.documents_by_product.setdefault(product_key, set()).add(name)
+            for column, text in self.product_fields.get(product_key, {}).items():
+                weight = SEARCH_FIELD_WEIGHTS[column]
+                column_tokens = self.tokenize(text)
+                for token in column_tokens:
+                    if tokens.get(token, 0) < weight:
+                        tokens[token] = weight
+                if column in SEARCH_SHORT_FIELDS:
+                    short_tokens |= column_tokens
+
+        self.document_tokens[name] = tokens
+        for token, weight in tokens.items():
+            postings = self.token_postings.get(token)
+            if postings is None:
+                postings = self.token_postings[token] = {}
+                self.add_grams(token, (3,))
+                self.trigram_counts[token] = len(self.grams(token, 3))
+            postings[name] = weight
+        for token in short_tokens - self.short_gram_tokens:
+            self.add_grams(token, (1, 2))
+            self.short_gram_tokens.add(token)
+
+    def add_grams(self, token, sizes):
+        for size in sizes:
+            # Tokens shorter than the gram size are reachable through their whole text
+            for gram in self.grams(token, size) or {token}:
+                self.gram_postings.setdefault(gram, set()).add(token)
+
+    def remove(self, name):
+        product_key = DatabaseManager.folder_product_key(name)
+        if product_key in self.documents_by_product:
+            self.documents_by_product[product_key].discard(name)
+            if not self.documents_by_product[product_key]:
+                del self.documents_by_product[product_key]
+
+        for token in self.document_tokens.pop(name):
+            postings = self.token_postings[token]
+            postings.pop(name, None)
+            if postings:
+                continue
+            del self.token_postings[token]
+            del self.trigram_counts[token]
+            self.short_gram_tokens.discard(token)
+            for size in (1, 2, 3):
+                for gram in self.grams(token, size) or {token}:
+                    tokens = self.gram_postings.get(gram)
+                    if tokens is not None:
+                        tokens.discard(token)
+                        if not tokens:
+                            del self.gram_postings[gram]
+
+    def matching_tokens(self, term):
+        """
+        Returns the tokens that contain the term. Terms never contain whitespace, so a text 
+        contains a term exactly when one of its tokens does.
+        """
+        grams = self.grams(term, min(len(term), 3))
+        candidates = None
+        # Smallest posting lists first, so the intersection shrinks quickly
+        for gram in sorted(grams, key=lambda gram: len(self.gram_postings.get(gram, ()))):
+            postings = self.gram_postings.get(gram)
+            if not postings:
+                return set()
+            candidates = set(postings) if candidates is None else candidates & postings
+            if not candidates:
+                return set()
+        return {token for token in candidates if term in token}
+
+    def fuzzy_tokens(self, term):
+        """
+        Returns {token: similarity} for the tokens whose trigram Jaccard similarity with the 
+        term reaches SEARCH_FUZZY_THRESHOLD, to forgive typos.
+        """
+        term_grams = self.grams(term, 3)
+        if len(term) < SEARCH_FUZZY_MIN_LENGTH:
+            return {}
+        shared = {}
+        for gram in term_grams:
+            for token in self.gram_postings.get(gram, ()):
+                if len(token) >= 3:
+                    shared[token] = shared.get(token, 0) + 1
+        similar = {}
+        for token, count in shared.items():
+            similarity = count / (len(term_grams) + self.trigram_counts[token] - count)
+            if similarity >= SEARCH_FUZZY_THRESHOLD:
+                similar[token] = similarity
+        return similar
+
+    def term_scores(self, term):
+        """
+        Scores every folder matching a term: the weight of the best field it matched in, times 
+        1 for a whole token, 0.8 for a token prefix and 0.6 for any other substring. Only when 
+        the term is found nowhere are similar tokens used, at half their similarity. Returns the 
+        scores and whether they are fuzzy.
+        """
+        term = term.upper()
+        qualities = {}
+        for token in self.matching_tokens(term):
+            qualities[token] = 1.0 if token == term else 0.8 if token.startswith(term) else 0.6
+        fuzzy = not qualities
+        if fuzzy:
+            qualities = {token: 0.5 * similarity for token, similarity in self.fuzzy_tokens(term).items()}
+
+        scores = {}
+        for token, quality in qualities.items():
+            for name, weight in self.token_postings[token].items():
+                score = quality * weight
+                if score > scores.get(name, 0):
+                    scores[name] = score
+        return scores, fuzzy
+
+    def search(self, terms, candidates=None):
+        """
+        Returns the folder names matching every term, best matches first and ties in sort key order, 
+        and whether the results can be narrowed. They can when no term was matched fuzzily and every 
+        term was long enough to be looked up in all columns: then the results of a query extending 
+        this one are a subset of these, and the caller can pass these as its candidates.
+        """
+        term_scores = [self.term_scores(term) for term in terms]
+        fuzzy = any(term_fuzzy for scores, term_fuzzy in term_scores)
+        if fuzzy:
+            candidates = None
+        narrowable = not fuzzy and all(len(term) >= 3 for term in terms)
+
+        totals = None
+        # Fewest matches first, so the running intersection stays small
+        for scores, term_fuzzy in sorted(term_scores, key=lambda item: len(item[0])):
+            if totals is None:
+                totals = {name: score for name, score in scores.items() if candidates is None or name in candidates}
+            else:
+                totals = {name: score + scores[name] for name, score in totals.items() if name in scores}
+            if not totals:
+                return [], narrowable
+        totals = totals or {}
+        return sorted(totals, key=lambda name: (-totals[name], self.sort_key(name))), narrowable
+
+class FolderOrder:
+    """
+    The folder names of the product list in display order. Sort keys are computed once per 
+    name, and adding or removing folders bisects them into place instead of sorting again. 
+    Folders are also mapped by the ID they start with, so a product is found by bisecting too.
+    """
+
+    def __init__(self, sort_key):
+        self.sort_key = sort_key
+        self.entries = []  # (sort key, name) in display order
+        self.names = []  # The names of entries, the sequence shown by the folder list
+        self.sort_keys = {}  # Folder name -> cached sort key
+        self.names_by_product = {}  # Upper case first word -> folder names
+
+    def key(self, name):
+        if name not in self.sort_keys:
+            try:
+                self.sort_keys[name] = self.sort_key(name)
+            except Exception:
+                self.sort_keys[name] = (float('inf'), name.lower())  # Names without words sort last
+        return self.sort_keys[name]
+
+    @staticmethod
+    def product_of(name):
+        words = name.split()
+        return words[0].upper() if words else None
+
+    def update(self, names):
+        """
+        Makes the order hold exactly the given folder names, only moving the differences.
+        """
+        names = set(names)
+        current = set(self.names)
+        removed, added = current - names, names - current
+        if len(removed) + len(added) > len(self.names) // 4:
+            # Many changes (like the first refresh) are cheaper to sort at once. Keys cached for 
+            # names that aren't listed (like search results of older folders) are dropped too.
+            self.sort_keys = {name: self.key(name) for name in names}
+            self.entries = sorted((self.sort_keys[name], name) for name in names)
+            self.names[:] = [name for _, name in self.entries]
+        else:
+            for name in removed:
+                position = bisect.bisect_left(self.entries, (self.key(name), name))
+                del self.entries[position]
+                del self.names[position]
+            for name in added:
+                entry = (self.key(name), name)
+                position = bisect.bisect_left(self.entries, entry)
+                self.entries.insert(position, entry)
+                self.names.insert(position, name)
+
+        for name in removed:
+            self.sort_keys.pop(name, None)
+            product_names = self.names_by_product.get(self.product_of(name))
+            if product_names is not None:
+                product_names.discard(name)
+                if not product_names:
+                    del self.names_by_product[self.product_of(name)]
+        for name in added:
+            self.names_by_product.setdefault(self.product_of(name), set()).add(name)
+
+    def position_of_product(self, product_id):
+        """
+        Returns the position of the first folder of the given product, or None.
+        """
+        product_names = self.names_by_product.get(product_id.upper())
+        if not product_names:
+            return None
+        return min(bisect.bisect_left(self.entries, (self.key(name), name)) for name in product_names)
+
+class TaskGraph:
+    """
+    Runs named tasks on a thread pool as soon as the tasks they depend on have finished.
+    Tasks whose dependencies failed are skipped. It contains no Tk code, the application
+    polls it from the event loop.
+    """
+
+    def __init__(self, max_workers=FIRST_RUN_WORKERS):
+        self.tasks = {}  # Task name -> (dependencies, function)
+        self.order = []  # Task names in the order they were added
+        self.status = {}  # Task name -> 'pending', 'running', 'done', 'failed' or 'skipped'
+        self.results = {}
+        self.errors = {}
+        self.started_at = {}
+        self.durations = {}  # Task name -> seconds spent running the task
+        self.futures = {}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def add_task(self, name, function, dependencies=()):
+        """
+        Adds a task. Dependencies must be added before the tasks that depend on them.
+        """
+        self.tasks[name] = (tuple(dependencies), function)
+        self.order.append(name)
+        self.status[name] = 'pending'
+
+    def start_ready_tasks(self):
+        """
+        Submits every pending task whose dependencies are done and skips the ones
+        that depend on a failed or skipped task.
+        """
+        for name in self.order:
+            if self.status[name] != 'pending':
+                continue
+            dependencies, function = self.tasks[name]
+            dependency_status = [self.status[dependency] for dependency in dependencies]
+            if any(status in ('failed', 'skipped') for status in dependency_status):
+                self.status[name] = 'skipped'
+            elif all(status == 'done' for status in dependency_status):
+                self.status[name] = 'running'
+                self.futures[name] = self.executor.submit(self.run_task, name, function)
+
+    def run_task(self, name, function):
+        self.started_at[name] = time.perf_counter()
+        try:
+            return function()
+        finally:
+            self.durations[name] = time.perf_counter() - self.started_at[name]
+
+    def collect_finished_tasks(self):
+        """
+        Records the results of the tasks that finished since the last call, starts the tasks
+        that were waiting on them and returns the names of the finished tasks.
+        """
+        finished = []
+        for name, future in list(self.futures.items()):
+            if not future.done():
+                continue
+            del self.futures[name]
+            try:
+                self.results[name] = future.result()
+                self.status[name] = 'done'
+            except Exception as e:
+                self.errors[name] = e
+                self.status[name] = 'failed'
+            finished.append(name)
+        self.start_ready_tasks()
+        return finished
+
+    def elapsed(self, name):
+        """
+        Returns the seconds a task ran for, or has been running for so far.
+        """
+        if name in self.durations:
+            return self.durations[name]
+        if name in self.started_at:
+            return time.perf_counter() - self.started_at[name]
         return None
 
+    def is_finished(self):
+        return not self.futures and all(status not in ('pending', 'running') for status in self.status.values())
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+class VirtualListbox(tk.Listbox):
+    """
+    Listbox that shows a Python sequence but only holds the rows that fit in the widget. 
+    Indexes passed to and returned by its methods refer to the whole sequence, so it is used 
+    like a plain Listbox, while replacing the items with set_items costs the same for ten 
+    folders or fifty thousand. Scrolling re-renders the visible window.
+    """
+
+    def __init__(self, master=None, **kwargs):
+        self.yscroll_callback = kwargs.pop('yscrollcommand', None)
+        super().__init__(master, **kwargs)
+        self.items = []
+        self.top = 0  # Index of the first rendered item
+        self.rows = 1  # Number of rendered rows, updated when the widget is resized
+        self.selected = None  # Index of the selected item, kept while it is scrolled out of view
+
+        # Bound on a tag ahead of the widget's own, so bindings made by the application do not 
+        # replace them and the wheel does not reach the Listbox class bindings
+        self.bindtags(('VirtualListbox',) + self.bindtags())
+        self.bind_class('VirtualListbox', '<Configure>', lambda event: event.widget.on_configure(event))
+        self.bind_class('VirtualListbox', '<<ListboxSelect>>', lambda event: event.widget.on_select(event))
+        self.bind_class('VirtualListbox', '<MouseWheel>', lambda event: event.widget.on_mousewheel(event))
+        self.bind_class('VirtualListbox', '<Button-4>', lambda event: event.widget.scroll_units(-3))
+        self.bind_class('VirtualListbox', '<Button-5>', lambda event: event.widget.scroll_units(3))
+
+    def configure(self, cnf=None, **kwargs):
+        # The scrollbar follows the whole sequence, not the rendered rows
+        if 'yscrollcommand' in kwargs:
+            self.yscroll_callback = kwargs.pop('yscrollcommand')
+            self.update_scrollbar()
+            if not cnf and not kwargs:
+                return None
+        return super().configure(cnf, **kwargs)
+
+    config = configure
+
+    def set_items(self, items):
+        """
+        Replaces the displayed sequence. The sequence is not copied, so the caller must not 
+        change it afterwards.
+        """
+        self.items = items
+        self.top = 0
+        self.selected = None
+        self.render()
+
+    def size(self):
+        return len(self.items)
+
+    def index_of(self, index):
+        if index == tk.END or index == 'end':
+            return len(self.items)
+        return int(index)
+
+    def get(self, first, last=None):
+        first = min(self.index_of(first), len(self.items) - 1)  # 'end' is the last item here
+        if last is None:
+            return self.items[first] if first >= 0 else ''
+        return tuple(self.items[max(first, 0):self.index_of(last) + 1])
+
+    def insert(self, index, *elements):
+        index = self.index_of(index)
+        self.items = list(self.items)
+        self.items[index:index] = elements
+        if self.selected is not None and self.selected >= index:
+            self.selected += len(elements)
+        self.render()
+
+    def delete(self, first, last=None):
+        first = self.index_of(first)
+        last = first if last is None else min(self.index_of(last), len(self.items) - 1)
+        if last < first:
+            return
+        self.items = list(self.items)
+        del self.items[first:last + 1]
+        if self.selected is not None:
+            if first <= self.selected <= last:
+                self.selected = None
+            elif self.selected > last:
+                self.selected -= last - first + 1
+        self.render()
+
+    def curselection(self):
+        return () if self.selected is None else (self.selected,)
+
+    def selection_set(self, first, last=None):
+        self.selected = self.index_of(first)
+        self.render()
+
+    select_set = selection_set
+
+    def selection_clear(self, first=None, last=None):
+        self.selected = None
+        super().selection_clear(0, tk.END)
+
+    select_clear = selection_clear
+
+    def see(self, index):
+        index = self.index_of(index)
+        if index < self.top:
+            self.scroll_to(index)
+        elif index >= self.top + self.rows - 1:
+            self.scroll_to(index - self.rows + 2)  # The last row can be partly hidden
+
+    def yview(self, *args):
+        """
+        Scrollbar command. Without arguments it returns the visible fraction of the sequence.
+        """
+        if not args:
+            total = max(len(self.items), 1)
+            return (self.top / total, min(self.top + self.rows, total) / total)
+        if args[0] == 'moveto':
+            self.scroll_to(round(float(args[1]) * len(self.items)))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            self.scroll_units(amount * (self.rows - 1) if args[2] == 'pages' else amount)
+
+    def scroll_units(self, amount):
+        self.scroll_to(self.top + amount)
+        return "break"
+
+    def scroll_to(self, top):
+        top = max(0, min(top, len(self.items) - self.rows + 1))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def on_mousewheel(self, event):
+        if abs(event.delta) >= 120:  # Windows reports multiples of 120
+            return self.scroll_units(-3 * (event.delta // 120))
+        return self.scroll_units(-event.delta)  # macOS reports small deltas
+
+    def on_configure(self, event):
+        border = int(self.cget('borderwidth')) + int(self.cget('highlightthickness'))
+        row_height = Font(font=self.cget('font')).metrics('linespace') + 2 * int(self.cget('selectborderwidth'))
+        rows = max(1, (event.height - 2 * border) // max(row_height, 1)) + 1
+        if rows != self.rows:
+            self.rows = rows
+            self.top = max(0, min(self.top, len(self.items) - self.rows + 1))
+            self.render()
+
+    def on_select(self, event):
+        # Clicks select a rendered row, translate it to the index in the sequence
+        rendered = super().curselection()
+        if rendered:
+            self.selected = self.top + rendered[0]
+        elif self.selected is not None and self.top <= self.selected < self.top + self.rows:
+            self.selected = None
+
+    def render(self):
+        super().delete(0, tk.END)
+        window = self.items[self.top:self.top + self.rows]
+        if window:
+            super().insert(tk.END, *window)
+        if self.selected is not None and self.top <= self.selected < self.top + len(window):
+            super().selection_set(self.selected - self.top)
+            super().activate(self.selected - self.top)
+        self.update_scrollbar()
+
+    def update_scrollbar(self):
+        if self.yscroll_callback:
+            first, last = self.yview()
+            self.yscroll_callback(first, last)
+
 class Application(tk.Frame):
 
     def __init__(self, master=None):
@@ -228,18 +1687,49 @@ class Application(tk.Frame):
         self.trigger_price_focus_out_flag = True
         self.running = True
         self.current_product_id = None
-        self.workbook_cache = None
-        self.workbook_path = None
-        self.image_cache = {}
+        self.image_cache = LRUByteCache(IMAGE_CACHE_BUDGET_BYTES)  # Picture bytes and thumbnails
+        self.thumbnail_store = ThumbnailStore()
+        self.image_reader = None  # XlsxImageReader of the workbook state in image_reader_fingerprint
+        self.image_reader_fingerprint = None
+        self.image_reader_lock = threading.Lock()
+        self.sheet_image_anchors = None  # (row, col) of the pictures of the workbook state in sheet_image_anchors_fingerprint
+        self.sheet_image_anchors_fingerprint = None
+        self.workbook_load_lock = threading.Lock()  # One openpyxl fallback load at a time
+        self.image_executor = ThreadPoolExecutor(max_workers=IMAGE_WORKERS)
+        self.image_generation = 0  # Bumped per image request, older requests are dropped
+        self.image_future = None  # Pending or running image request
+        self.prefetch_executor = ThreadPoolExecutor(max_workers=1)
+        self.prefetch_generation = 0  # Bumped per selection, stops the prefetch of the previous one
+        self.prefetch_future = None
+        self.prefetch_db_manager = None  # Connection of the prefetch thread, only used there
+        self.word_doc_executor = None  # Process pool writing Word documents, while a batch runs
+        self.product_details_cache = OrderedDict()  # Product ID -> details prepared by load_product_details
+        self.product_details_version = 0  # Bumped when products or folders change, older prefetches are discarded
+        self.browse_direction = 0  # 1 or -1 while walking the list with the arrow keys, 0 after a click
+        self.workbook_reload_in_progress = False
+        self.edit_journal = EditJournal()
+        self.journal_flush_lock = threading.Lock()
+        self.journal_flush_job = None  # after() id of the scheduled journal flush
+        self.journal_flush_in_progress = False
+        self.folder_order = FolderOrder(self.custom_sort_key)  # Sorted contents of the folder list
+        self.folder_search_index = FolderSearchIndex(self.folder_order.key)
+        self.search_job = None  # after() id of the debounced search
+        self.last_search_query = None
+        self.last_search_results = None  # Results of last_search_query, narrowed when the query is extended
+        self.search_fields_fingerprint = None  # Workbook state whose columns are in the search index
+        self.search_index_build = 0  # Bumped per background rebuild, only the latest one is swapped in
+        self.search_index_edits = None  # Products saved while a rebuild runs, re-applied when it is swapped in
         #self.trigger_save_flag = False # Can be used to save when pressing enter once while in Product Price (+IVU) entry.
 
         self.configure_logger()
-        self.cache_images_on_load()
         self.load_settings()
         self.Main_Window_Widgets() 
         self.combine_and_display_folders()
         self.master.update_idletasks()
+        self.replay_edit_journal()
+        self.excel_manager.filepath, self.excel_manager.sheet_name = self.load_excel_path_and_sheet()
         self.update_excel_file_on_start_question()
+        self.after(WORKBOOK_POLL_INTERVAL_MS, self.watch_workbook)
         #self.first_run()
         #remove update_folders_path function?
 
@@ -262,27 +1752,6 @@ class Application(tk.Frame):
         # Log the start of the application
         self.logger.info("----Inventory Management Application started----")
 
-    def cache_images_on_load(self):
-        self.logger.info("Starting to cache images on load")
-
-        # Load Excel settings
-        filepath, sheet_name = self.load_excel_path_and_sheet()
-        if filepath and sheet_name:
-            # Validate file and sheet
-            if not os.path.exists(filepath):
-                self.logger.error(f"Excel file not found at {filepath}. Skipping image caching.")
-                return
-            # Additional validation for sheet can be added here if necessary
-
-            self.logger.info(f"Excel settings loaded with filepath: {filepath} and sheet_name: {sheet_name}")
-            try:
-                self.cache_images(filepath, sheet_name)
-                self.logger.info("Images have been successfully cached")
-            except Exception as e:
-                self.logger.error(f"An error occurred while caching images: {e}")
-        else:
-            self.logger.error("Failed to load Excel settings or they are incomplete. Skipping image caching.")
-
     def load_settings(self):
         self.logger.info("Attempting to load folders' paths from file")
         try:
@@ -306,19 +1775,282 @@ class Application(tk.Frame):
     #         ''', (self.inventory_folder,))
     #         self.logger.info(f"Inventory folder path updated to: {self.inventory_folder}")
 
-    #         # Update the table with the new paths for the sold folder
-    #         self.db_manager.cur.execute('''
-    #             UPDATE folder_paths SET Path = ? WHERE Folder = 'Sold'
-    #         ''', (self.sold_folder,))
-    #         self.logger.info(f"Sold folder path updated to: {self.sold_folder}")
+    #         # Update the table with the new paths for the sold folder
+    #         self.db_manager.cur.execute('''
+    #             UPDATE folder_paths SET Path = ? WHERE Folder = 'Sold'
+    #         ''', (self.sold_folder,))
+    #         self.logger.info(f"Sold folder path updated to: {self.sold_folder}")
+
+    #         # Commit the changes to the database
+    #         self.db_manager.conn.commit()
+    #         self.logger.info("Settings saved successfully")
+
+    #     except Exception as e:
+    #         self.logger.error(f"Error saving settings: {e}")
+    
+    def watch_workbook(self):
+        """
+        Polls the workbook's size and modification time from the Tk event loop. When the workbook 
+        was changed outside the application, the sheet is parsed in a worker thread and swapped 
+        in once it's ready, so selections never wait for the workbook to be parsed.
+        """
+        if not self.running:
+            return
+
+        try:
+            # The sheet is also read in the background at startup, so the search covers its columns right away
+            needs_first_load = (self.excel_manager.data_frame is None and self.excel_manager.sheet_name
+                                and self.excel_manager.workbook_fingerprint() is not None)
+            if not self.workbook_reload_in_progress and (needs_first_load or self.excel_manager.has_source_changed()):
+                self.logger.info("Workbook changed on disk, reloading it in the background")
+                self.workbook_reload_in_progress = True
+                reader = ExcelManager(self.excel_manager.filepath, self.excel_manager.sheet_name)
+                threading.Thread(target=self.reload_workbook_task, args=(reader,), daemon=True).start()
+        except Exception as e:
+            self.workbook_reload_in_progress = False
+            self.logger.error(f"Error checking the workbook for changes: {e}")
+
+        self.after(WORKBOOK_POLL_INTERVAL_MS, self.watch_workbook)
+
+    def reload_workbook_task(self, reader):
+        """
+        Reads the changed workbook into a separate ExcelManager off the Tk thread and hands 
+        the result back to the main thread. The products table is imported here as well, 
+        so the Tk thread only has to swap the data in.
+        """
+        imported = False
+        try:
+            with self.excel_manager.workbook_lock:  # Waits for a save of the workbook to finish
+                reader.load_data()
+            if reader.data_frame is not None:
+                db_manager = DatabaseManager()
+                try:
+                    imported = self.import_product_store(db_manager, reader)
+                finally:
+                    db_manager.conn.close()
+        except Exception as e:
+            self.logger.error(f"Error reloading the workbook in the background: {e}")
+            reader = None
+
+        if self.running:
+            self.after(0, lambda: self.apply_reloaded_workbook(reader, imported))
+
+    def apply_reloaded_workbook(self, reader, imported=False):
+        """
+        Swaps the reloaded sheet into the application's ExcelManager. Runs on the Tk thread, 
+        so no selection can observe a half-updated state.
+        """
+        self.workbook_reload_in_progress = False
+        if reader is None or reader.data_frame is None:
+            return
+
+        # The workbook or sheet may have been changed in the settings while reloading
+        if not self.excel_manager.is_current_source(reader.loaded_fingerprint):
+            self.logger.info("Discarded reloaded workbook data for a workbook that is no longer selected")
+            return
+
+        self.excel_manager.swap_data(reader.loaded_fingerprint, reader.data_frame, reader.product_index)
+
+        # Edits that are still in the journal aren't in the workbook yet
+        _, edits = self.edit_journal.pending()
+        for product_id, product_data in edits.items():
+            self.excel_manager.update_cached_product(product_id, product_data)
+        if imported:
+            self.invalidate_product_details()
+            self.logger.info("Products table imported from the workbook")
+        self.sync_product_store()  # Only imports if the worker's import failed
+        self.logger.info("Reloaded workbook data swapped in")
+
+    def load_product_store(self):
+        """
+        Makes sure the selected sheet is loaded and mirrored in the products table.
+        Returns False if no Excel database is configured.
+        """
+        filepath, sheet_name = self.load_excel_path_and_sheet()
+        if not filepath or not sheet_name:
+            return False
+
+        self.excel_manager.filepath = filepath
+        self.excel_manager.sheet_name = sheet_name
+        self.excel_manager.ensure_data_loaded()  # Workbook changes are reloaded by watch_workbook
+        self.sync_product_store()
+        return True
+
+    def sync_product_store(self):
+        """
+        Mirrors the loaded sheet into the products table, which the product form, Word documents,
+        reports and folder routing read from. The import is skipped if the workbook hasn't changed
+        since the last one.
+        """
+        if self.excel_manager.data_frame is None or self.excel_manager.has_source_changed():
+            return  # watch_workbook imports the workbook once it's reloaded
+        if self.db_manager.sync_products(self.excel_manager.loaded_fingerprint, self.excel_manager.data_frame):
+            self.invalidate_product_details()
+            self.logger.info("Products table imported from the workbook")
+        self.refresh_search_fields()
+
+    def refresh_search_fields(self):
+        """
+        Indexes the searchable columns of the loaded sheet for the search, unless they were 
+        already indexed for this state of the workbook. A few changed products are re-indexed 
+        in place; larger changes (like the first load) are indexed by build_search_index_task 
+        so the window stays responsive, searches use the previous index meanwhile.
+        """
+        data_frame = self.excel_manager.data_frame
+        if data_frame is None or self.search_fields_fingerprint == self.excel_manager.loaded_fingerprint:
+            return
+
+        columns = [column for column in SEARCH_FIELD_WEIGHTS if column in data_frame.columns]
+        values = data_frame[columns].to_numpy()
+        product_fields = {product_key: dict(zip(columns, values[position]))
+                          for product_key, position in self.excel_manager.product_index.items()}
+        self.search_fields_fingerprint = self.excel_manager.loaded_fingerprint
+        self.search_index_build += 1
+
+        changes = self.folder_search_index.product_changes(product_fields)
+        if len(changes) <= SEARCH_INLINE_PRODUCT_CHANGES:
+            for product_key, fields in changes.items():
+                self.folder_search_index.apply_product(product_key, fields)
+            self.search_index_edits = None
+            self.last_search_results = None
+            self.logger.info("Sheet columns indexed for the search")
+            return
+
+        self.search_index_edits = {}
+        names = list(self.folder_search_index.document_tokens)
+        threading.Thread(target=self.build_search_index_task,
+                         args=(self.search_index_build, names, product_fields), daemon=True).start()
+
+    def build_search_index_task(self, build, names, product_fields):
+        """
+        Worker thread part of refresh_search_fields. Builds a new index of the given folder names 
+        and column values; it shares nothing with the Tk thread until it is swapped in.
+        """
+        try:
+            search_index = FolderSearchIndex(self.folder_order.key)  # Only called when searching, on the Tk thread
+            search_index.set_products(product_fields)
+            search_index.update(names)
+        except Exception as e:
+            self.logger.error(f"Error building the search index: {e}")
+            return
+        if self.running:
+            self.after(0, lambda: self.swap_search_index(build, search_index))
+
+    def swap_search_index(self, build, search_index):
+        """
+        Replaces the search index with one built by build_search_index_task, unless a newer 
+        build was started. Folder and product changes made during the build are applied first.
+        """
+        if build != self.search_index_build:
+            return
+        search_index.update(self.folder_search_index.document_tokens)
+        for product_key, fields in (self.search_index_edits or {}).items():
+            search_index.set_product(product_key, fields)
+        self.search_index_edits = None
+        self.folder_search_index = search_index
+        self.last_search_results = None
+        self.logger.info("Sheet columns indexed for the search")
+
+    def refresh_product_store_task(self, db_manager, filepath, sheet_name):
+        """
+        Worker thread counterpart of load_product_store. Reads the workbook as it is on disk into a 
+        separate ExcelManager and imports it through db_manager, so the products table reflects 
+        first run steps that just rewrote the workbook.
+        """
+        reader = ExcelManager(filepath, sheet_name)
+        with self.excel_manager.workbook_lock:  # A workbook that is being saved can't be read
+            reader.load_data()
+        if reader.data_frame is not None:
+            self.import_product_store(db_manager, reader)
+
+    def import_product_store(self, db_manager, reader):
+        """
+        Imports a sheet read by a separate ExcelManager through db_manager, with the edits 
+        that are still in the journal applied.
+        """
+        _, edits = self.edit_journal.pending()
+        for product_id, product_data in edits.items():
+            reader.update_cached_product(product_id, product_data)
+        return db_manager.sync_products(reader.loaded_fingerprint, reader.data_frame)
+
+    def store_cached_product(self, product_id):
+        """
+        Copies a product's row from the data in memory to the products table after it was edited.
+        """
+        product_info = self.excel_manager.get_product_info(product_id)
+        if product_info:
+            self.db_manager.save_product(product_info)
+            self.invalidate_product_details()
+            product_key = ExcelManager.normalize_product_id(product_id)
+            self.folder_search_index.set_product(product_key, product_info)
+            if self.search_index_edits is not None:
+                self.search_index_edits[product_key] = product_info
+            self.last_search_results = None
+
+    def replay_edit_journal(self):
+        """
+        Writes edits left in the journal by a previous session (e.g. after a crash) to the workbook.
+        """
+        if not self.edit_journal.has_pending():
+            return
+
+        self.logger.info("Replaying journaled edits from a previous session")
+        self.excel_manager.filepath, self.excel_manager.sheet_name = self.load_excel_path_and_sheet()
+        try:
+            flushed = self.flush_edit_journal()
+            self.logger.info(f"Replayed journaled edits for {flushed} products")
+        except Exception as e:
+            self.logger.error(f"Error replaying journaled edits, they will be retried: {e}")
+            self.schedule_journal_flush(JOURNAL_RETRY_DELAY_MS)
+
+    def flush_edit_journal(self):
+        """
+        Writes every journaled edit to the workbook in a single load/save cycle, then removes 
+        them from the journal. Returns the number of products written. Safe to call from any thread.
+        """
+        with self.journal_flush_lock:
+            last_id, edits = self.edit_journal.pending()
+            if not edits or not self.excel_manager.filepath:
+                return 0
+            self.excel_manager.apply_product_edits(edits)
+            self.edit_journal.discard_through(last_id)
+            self.logger.info(f"Flushed journaled edits for {len(edits)} products to the workbook")
+            return len(edits)
+
+    def schedule_journal_flush(self, delay=JOURNAL_FLUSH_DELAY_MS):
+        """
+        Restarts the timer after which journaled edits are flushed, so a burst of saves 
+        is written to the workbook once things are idle.
+        """
+        if self.journal_flush_job is not None:
+            self.after_cancel(self.journal_flush_job)
+        self.journal_flush_job = self.after(delay, self.flush_edit_journal_in_background)
+
+    def flush_edit_journal_in_background(self):
+        self.journal_flush_job = None
+        if self.journal_flush_in_progress:
+            self.schedule_journal_flush()
+            return
+        self.journal_flush_in_progress = True
+        threading.Thread(target=self.flush_journal_task, daemon=True).start()
+
+    def flush_journal_task(self):
+        try:
+            flushed = self.flush_edit_journal()
+        except Exception as e:
+            self.logger.error(f"Error flushing journaled edits to the workbook, retrying later: {e}")
+            flushed = None
+
+        if self.running:
+            self.after(0, lambda: self.finish_journal_flush(flushed))
 
-    #         # Commit the changes to the database
-    #         self.db_manager.conn.commit()
-    #         self.logger.info("Settings saved successfully")
+    def finish_journal_flush(self, flushed):
+        self.journal_flush_in_progress = False
+        if flushed is None:
+            self.schedule_journal_flush(JOURNAL_RETRY_DELAY_MS)
+        elif self.edit_journal.has_pending():
+            self.schedule_journal_flush()
 
-    #     except Exception as e:
-    #         self.logger.error(f"Error saving settings: {e}")
-    
     def update_excel_file_on_start_question(self):
         """
         Displays a dialog asking the user if they want to update Excel empty fields.
@@ -341,14 +2073,121 @@ class Application(tk.Frame):
         """
         Executes a series of operations including updating Excel data, updating prices,
         updating folder paths, generating a report of products to sell, and checking for missing Word documents.
+        The operations run on worker threads as soon as the ones they depend on are done, so the folder 
+        moves run while the prices are written to the workbook and the application stays usable. 
+        The *_task methods they call don't touch Tk, and read the database through the db_manager 
+        they're given, opened on their worker thread.
         """
         self.logger.info("Starting first run operations.")
-        self.update_excel_data()
-        self.update_prices()
-        self.update_all_folder_paths_and_names()
-        self.products_to_sell_report()
-        self.check_for_missing_word_docs()
-        self.logger.info("Completed first run operations.")
+        filepath, sheet_name = self.load_excel_path_and_sheet()
+
+        # Workbook steps run one after the other, filesystem steps run next to them
+        graph = TaskGraph()
+        graph.add_task('excel_data', lambda: self.first_run_excel_data(filepath, sheet_name))
+        graph.add_task('prices', self.update_prices_task, ['excel_data'])
+        graph.add_task('folders', self.first_run_folders, ['excel_data'])
+        graph.add_task('report', lambda: self.first_run_report(filepath, sheet_name), ['prices', 'folders'])
+        graph.add_task('word_docs', self.first_run_word_docs, ['folders'])
+
+        self.show_first_run_progress([
+            ('excel_data', "Update Excel empty fields"),
+            ('prices', "Update prices"),
+            ('folders', "Move product folders"),
+            ('report', "Products to sell report"),
+            ('word_docs', "Check for missing Word documents"),
+        ])
+        graph.start_ready_tasks()
+        self.after(FIRST_RUN_POLL_INTERVAL_MS, lambda: self.poll_first_run(graph))
+
+    def first_run_excel_data(self, filepath, sheet_name):
+        if not self.update_excel_data_task():
+            raise ValueError("Necessary columns not found.")
+        # Imported before the prices are written, so the folder moves don't read the workbook meanwhile
+        db_manager = DatabaseManager()
+        try:
+            self.refresh_product_store_task(db_manager, filepath, sheet_name)
+        finally:
+            db_manager.conn.close()
+
+    def first_run_folders(self):
+        db_manager = DatabaseManager()
+        try:
+            self.move_product_folders_task(db_manager)
+        finally:
+            db_manager.conn.close()
+
+    def first_run_report(self, filepath, sheet_name):
+        db_manager = DatabaseManager()
+        try:
+            self.refresh_product_store_task(db_manager, filepath, sheet_name)  # Picks up the updated prices
+            return self.products_to_sell_report_task(db_manager, sheet_name)
+        finally:
+            db_manager.conn.close()
+
+    def first_run_word_docs(self):
+        db_manager = DatabaseManager()
+        try:
+            return self.find_missing_word_docs(db_manager)
+        finally:
+            db_manager.conn.close()
+
+    def poll_first_run(self, graph):
+        """
+        Hands the results of finished first run tasks to the Tk thread and refreshes the progress panel.
+        """
+        for name in graph.collect_finished_tasks():
+            if graph.status[name] == 'failed':
+                self.logger.error(f"First run task '{name}' failed: {graph.errors[name]}")
+                continue
+            self.logger.info(f"First run task '{name}' finished in {graph.durations[name]:.2f} seconds")
+            self.invalidate_product_details()  # The task may have re-imported the products table
+            if name == 'folders':
+                self.combine_and_display_folders()
+            elif name == 'report':
+                self.open_report(graph.results[name])
+            elif name == 'word_docs' and graph.results[name]:
+                self.prompt_missing_word_docs(graph.results[name])
+
+        self.update_first_run_progress(graph)
+        if graph.is_finished():
+            graph.shutdown()
+            self.logger.info("Completed first run operations.")
+        elif self.running:
+            self.after(FIRST_RUN_POLL_INTERVAL_MS, lambda: self.poll_first_run(graph))
+
+    def show_first_run_progress(self, stages):
+        """
+        Opens a panel listing the first run tasks with their status and how long they took.
+        """
+        self.first_run_window = Toplevel(self.master)
+        self.first_run_window.title("Startup Tasks")
+        self.first_run_window.resizable(False, False)
+
+        self.first_run_rows = {}
+        for row, (name, label) in enumerate(stages):
+            ttk.Label(self.first_run_window, text=label).grid(row=row, column=0, sticky='w', padx=10, pady=2)
+            status_label = ttk.Label(self.first_run_window, text="Waiting", width=40)
+            status_label.grid(row=row, column=1, sticky='w', padx=10, pady=2)
+            duration_label = ttk.Label(self.first_run_window, text="", width=8)
+            duration_label.grid(row=row, column=2, sticky='e', padx=10, pady=2)
+            self.first_run_rows[name] = (status_label, duration_label)
+
+        ttk.Button(self.first_run_window, text="Close", command=self.first_run_window.destroy).grid(
+            row=len(stages), column=0, columnspan=3, pady=10)
+
+    def update_first_run_progress(self, graph):
+        if not self.first_run_window.winfo_exists():
+            return  # The panel was closed, the tasks keep running
+
+        status_text = {'pending': "Waiting", 'running': "Running...", 'done': "Done", 'skipped': "Skipped"}
+        for name, (status_label, duration_label) in self.first_run_rows.items():
+            status = graph.status[name]
+            if status == 'failed':
+                status_label.config(text=f"Failed: {graph.errors[name]}"[:60])
+            else:
+                status_label.config(text=status_text[status])
+            elapsed = graph.elapsed(name)
+            duration_label.config(text=f"{elapsed:.1f}s" if elapsed is not None else "")
 
 
     def Main_Window_Widgets(self):
@@ -368,7 +2207,7 @@ class Application(tk.Frame):
 
             self.search_entry = ttk.Entry(self.search_frame, width=30)  # Same width as the Listbox
             self.search_entry.pack(side='left', fill='x', anchor='w')
-            self.search_entry.bind('<KeyRelease>', self.search)
+            self.search_entry.bind('<KeyRelease>', self.schedule_search)
 
             self.bottom_frame = ttk.Frame(self)
             self.bottom_frame.pack(fill='both', expand=True)
@@ -379,7 +2218,7 @@ class Application(tk.Frame):
             self.list_frame = ttk.Frame(self.list_outer_frame)
             self.list_frame.pack(side='left', fill='both', expand=True)
 
-            self.folder_list = tk.Listbox(self.list_frame, width=30)
+            self.folder_list = VirtualListbox(self.list_frame, width=30)
             self.folder_list.pack(side='left', fill='both', expand=False)
             self.folder_list.bind('<<ListboxSelect>>', self.display_product_details)
 
@@ -403,9 +2242,13 @@ class Application(tk.Frame):
             if current_selection:
                 next_index = current_selection[0] + 1
                 if next_index < self.folder_list.size():
-                    self.folder_list.selection_clear(current_selection)
+                    self.browse_direction = 1
+                    self.folder_list.selection_clear()
                     self.folder_list.selection_set(next_index)
                     self.folder_list.see(next_index)
+                    self.folder_list.event_generate("<<ListboxSelect>>")
+                    self.browse_direction = 0
+        return "break"  # The Listbox class binding would move the selection within the rendered rows
 
     def previous_product(self, event):
         if self.folder_list.size() > 0:
@@ -413,21 +2256,22 @@ class Application(tk.Frame):
             if current_selection:
                 prev_index = current_selection[0] - 1
                 if prev_index >= 0:
-                    self.folder_list.selection_clear(current_selection)
+                    self.browse_direction = -1
+                    self.folder_list.selection_clear()
                     self.folder_list.selection_set(prev_index)
                     self.folder_list.see(prev_index)
+                    self.folder_list.event_generate("<<ListboxSelect>>")
+                    self.browse_direction = 0
+        return "break"
 
     def combine_and_display_folders(self):
         """
         Combines and displays the folder names from various paths including inventory, sold, 
         to sell, damaged, and personal folders. Updates these folder paths in the database. 
-        The folder list is first cleared, then updated with the combined and sorted folder names.
+        The folder list is then replaced with the combined and sorted folder names.
         """
         self.logger.info("Combining and displaying folders")
 
-        # Clear the folder list first
-        self.folder_list.delete(0, tk.END)
-
         # Initialize additional folders based on the inventory folder
         if self.inventory_folder:
             parent_dir = os.path.dirname(self.inventory_folder)
@@ -439,81 +2283,64 @@ class Application(tk.Frame):
                 if not os.path.exists(folder):
                     os.makedirs(folder)
 
-        # Begin a transaction
-        self.db_manager.cur.execute("BEGIN")
+        # Combine the folders from all paths including damaged and personal folders. Only the 
+        # folders that changed since the last refresh are listed again, new ones are saved to folder_paths.
+        combined_folders = []
         try:
-            # Combine the folders from all paths including damaged and personal folders
-            combined_folders = []
-            for folder_path in [self.inventory_folder, self.sold_folder, self.to_sell_folder, self.damaged_folder, self.personal_folder]:
-                if folder_path and os.path.exists(folder_path):
-                    for root, dirs, files in os.walk(folder_path):
-                        for dir_name in dirs:
-                            combined_folders.append(dir_name)
-                            full_path = os.path.join(root, dir_name)
-                            # Update the database with the current folder paths
-                            self.db_manager.cur.execute("INSERT OR REPLACE INTO folder_paths (Folder, Path) VALUES (?, ?)", (dir_name, full_path))
-            self.db_manager.conn.commit()  # Commit the transaction if all is well
+            roots = [self.inventory_folder, self.sold_folder, self.to_sell_folder, self.damaged_folder, self.personal_folder]
+            combined_folders = [name for name, path in self.db_manager.refresh_directory_index(roots)]
+            # Keep the search index in step with the folders on disk
+            self.folder_search_index.update(name for name, path in self.db_manager.get_leaf_folders())
+            self.last_search_results = None
+            self.invalidate_product_details()  # Folder paths may have changed
         except Exception as e:
-            self.db_manager.conn.rollback()  # Rollback if there was an error
             self.logger.error(f"Database error in combine_and_display_folders: {e}")
 
-        # Deduplicate folder names
-        unique_folders = list(set(combined_folders))
+        # Deduplicate folder names and move the ones that were added or removed into place, 
+        # sorted by the custom sort key
+        self.folder_order.update(combined_folders)
 
-        # Sort using the custom sort key function
-        sorted_folders = sorted(unique_folders, key=self.custom_sort_key)
-
-        # Insert the sorted folders into the list widget
-        for folder in sorted_folders:
-            self.folder_list.insert(tk.END, folder)
+        # Show the sorted folders in the list widget, only the visible rows are rendered
+        self.folder_list.set_items(self.folder_order.names)
         self.logger.info("Folders combined, sorted, and displayed")
 
+    def schedule_search(self, event=None):
+        """
+        Debounces the search entry. Every keystroke cancels the search that is waiting to run, 
+        and the search only runs once typing pauses.
+        """
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(SEARCH_DEBOUNCE_MS, lambda: self.search(None))
+
     def search(self, event):
         """
         Searches for folders based on the user's input in the search entry. 
         The search is case-insensitive and looks for matches in all relevant folders including
-        inventory, sold, to sell, damaged, and personal folders.
+        inventory, sold, to sell, damaged, and personal folders, through the folder search index.
         """
+        self.search_job = None
         self.logger.info("Performing search based on user input")
-        search_terms = self.search_entry.get().split()  # Split the search string into words
+        query = self.search_entry.get()
+        search_terms = query.split()  # Split the search string into words
         if search_terms:
-            self.folder_list.delete(0, tk.END)  # Clear the current list
-
-            # Define a list of folder paths to search in
-            search_paths = [
-                self.inventory_folder,
-                self.sold_folder,
-                self.to_sell_folder,
-                self.damaged_folder,
-                self.personal_folder
-            ]
-
-            # Filter out None or invalid paths
-            valid_search_paths = [path for path in search_paths if path and os.path.exists(path)]
-
-            # Create a list to store matching folder names
-            matching_folders = []
-
-            # Perform the search in each valid path
-            for path in valid_search_paths:
-                for root, dirs, files in os.walk(path):
-                    # Check if 'dirs' is empty, meaning 'root' is a leaf directory
-                    if not dirs:
-                        folder_name = os.path.basename(root)  # Get the name of the leaf directory
-                        # Check if all search terms are in the folder name (case insensitive)
-                        if all(term.upper() in folder_name.upper() for term in search_terms):
-                            matching_folders.append(folder_name)
-
-            # Sort the matching folder names alphabetically
-            matching_folders.sort()
-
-            # Insert the sorted folder names into the list widget
-            for folder_name in matching_folders:
-                self.folder_list.insert(tk.END, folder_name)
+            # Leaf folders matching all search terms (case insensitive) in their name or their product's 
+            # columns, ranked by relevance, from the in-memory index kept up to date by 
+            # combine_and_display_folders and sync_product_store
+            candidates = None
+            if self.last_search_results is not None and query.startswith(self.last_search_query):
+                # The query was extended, so only the previous results can still match
+                candidates = set(self.last_search_results)
+            matching_folders, narrowable = self.folder_search_index.search(search_terms, candidates)
+            self.last_search_query, self.last_search_results = query, matching_folders if narrowable else None
+
+            # Show the ranked folder names in the list widget
+            self.folder_list.set_items(matching_folders)
 
             self.logger.info("Search completed and sorted results displayed")
 
         else:
+            self.last_search_query, self.last_search_results = None, None
             self.combine_and_display_folders()  # If the search box is empty, display all folders   
             self.logger.info("Search box is empty, displaying all folders")
 
@@ -596,55 +2423,92 @@ class Application(tk.Frame):
     
     def create_all_word_docs(self):
         """
-        Creates Word documents for all items listed in the correlation window.
+        Creates Word documents for all items listed in the correlation window. The products' 
+        folders and records are fetched in one pass, then the documents are written by a process 
+        pool while poll_word_docs removes finished items and shows the progress in the window.
         """
 
         # Log the start of creating all Word documents
         self.logger.info("Starting the creation of all Word documents")
 
-        for iid in self.correlate_tree.get_children():
-            item_values = self.correlate_tree.item(iid, 'values')
-            doc_data = (item_values[0], item_values[1], item_values[2])
-
-            # Log the data of each item being processed
-            self.logger.info(f"Creating Word document for item: {doc_data}")
+        items = [(iid, self.correlate_tree.item(iid, 'values')) for iid in self.correlate_tree.get_children()]
+        sources = self.db_manager.get_document_sources([item_values[1] for _, item_values in items])
+
+        jobs, failures = [], []
+        for iid, item_values in items:
+            product_id = item_values[1]
+            folder_path, product_info = sources.get(ExcelManager.normalize_product_id(product_id), (None, None))
+            if not folder_path:
+                self.logger.error(f"No folder found for product ID {product_id}")
+                failures.append(product_id)
+                continue
+            # Path for the new Word document named 'Product Information.docx'
+            doc_path = os.path.join(folder_path, 'Product Information.docx')
+            jobs.append((iid, doc_path, product_document_values(product_id, product_info)))
+
+        self.yes_to_all_button.config(state='disabled')
+        self.word_doc_executor = ProcessPoolExecutor(max_workers=WORD_DOC_WORKERS)
+        futures = {}
+        for start in range(0, len(jobs), WORD_DOC_BATCH_SIZE):
+            chunk = jobs[start:start + WORD_DOC_BATCH_SIZE]
+            futures[self.word_doc_executor.submit(write_product_documents, chunk)] = chunk
+        batch = {'futures': futures, 'total': len(jobs), 'created': 0,
+                 'failures': failures, 'started_at': time.perf_counter()}
+        self.logger.info(f"Writing {len(jobs)} Word documents with {WORD_DOC_WORKERS} processes")
+        self.poll_word_docs(batch)
+
+    def poll_word_docs(self, batch):
+        """
+        Removes the items whose documents were written from the correlation window and shows the 
+        progress, until every document of the batch is done.
+        """
+        window_open = hasattr(self, 'correlate_window') and self.correlate_window.winfo_exists()
+        for future in [future for future in batch['futures'] if future.done()]:
+            chunk = batch['futures'].pop(future)
+            try:
+                results = future.result()
+            except Exception as e:  # e.g. a worker process died
+                results = [(iid, str(e)) for iid, _, _ in chunk]
+            for (iid, error), (_, _, values) in zip(results, chunk):
+                if error:
+                    self.logger.error(f"Failed to create document for product ID {values['Product ID']}: {error}")
+                    batch['failures'].append(values['Product ID'])
+                    continue
+                batch['created'] += 1
+                if window_open:
+                    try:
+                        self.correlate_tree.delete(iid)
+                    except Exception as e:
+                        self.logger.error(f"Error while updating the Treeview: {e}")
 
-            self.create_word_doc(doc_data, iid, show_message=False)
+        if window_open:
+            self.word_doc_progress_label.config(text=f"Created {batch['created']} of {batch['total']} Word documents")
+        if batch['futures']:
+            self.after(WORD_DOC_POLL_INTERVAL_MS, lambda: self.poll_word_docs(batch))
+            return
 
-        messagebox.showinfo("Success", "All Word documents have been created.")
-        self.correlate_window.destroy()
-        self.Settings_Window_Start()
+        self.word_doc_executor.shutdown(wait=False)
+        self.word_doc_executor = None
+        elapsed = time.perf_counter() - batch['started_at']
+        self.logger.info(f"{batch['created']} Word documents created in {elapsed:.1f} seconds")
+        if batch['failures']:
+            failed = ', '.join(str(product_id) for product_id in batch['failures'][:10])
+            more = f" and {len(batch['failures']) - 10} more" if len(batch['failures']) > 10 else ''
+            messagebox.showerror("Error", f"Failed to create Word documents for Product IDs {failed}{more}. See the log for details.")
+        else:
+            messagebox.showinfo("Success", "All Word documents have been created.")
+        if window_open:
+            self.correlate_window.destroy()
+            self.Settings_Window_Start()
 
         # Log the completion of creating all Word documents
-        self.logger.info("All Word documents created successfully")
+        self.logger.info("All Word documents created")
 
     def create_word_doc(self, doc_data, iid, show_message=True):
         """
         Creates a Word document for a specific product, pulling relevant information from the Excel data. 
         The document includes details like product ID, name, price, link, and comments.
         """
-        def safe_format_currency(value):
-            try:
-                return f"${float(value):.2f}" if value is not None else "N/A"
-            except ValueError:
-                return str(value)
-
-        def safe_format_percentage(value):
-            try:
-                return f"{float(value)}%" if value is not None else "N/A"
-            except ValueError:
-                return str(value)
-            
-        def add_styled_paragraph(doc, text, variable_text):
-            p = doc.add_paragraph()
-            run = p.add_run(text)
-            run.bold = True
-            run.italic = True
-            run.underline = True
-            run.font.highlight_color = WD_COLOR_INDEX.BRIGHT_GREEN  # Applying light green highlight
-            run.font.size = Pt(12)  # Setting font size to 12
-            p.add_run(variable_text)
-
 
         # Log the start of the Word document creation process
         self.logger.info(f"Creating Word document for product ID {doc_data[1]}")
@@ -655,111 +2519,12 @@ class Application(tk.Frame):
         folder_path = self.get_folder_path_from_db(str(product_id))
 
         if folder_path:
-            try:
-                # Retrieve the product link
-                product_price_series = self.excel_manager.data_frame.loc[self.excel_manager.data_frame['Product ID'] == product_id, 'Product Price']
-                if not product_price_series.empty:
-                    product_price = product_price_series.iloc[0]
-                else:
-                    product_price = "N/A"  # Default to "N/A" if not found
-
-                # Retrieve the product link
-                ivu_tax_series = self.excel_manager.data_frame.loc[self.excel_manager.data_frame['Product ID'] == product_id, 'IVU Tax']
-                if not ivu_tax_series.empty:
-                    ivu_tax = ivu_tax_series.iloc[0]
-                else:
-                    ivu_tax = "N/A"  # Default to "N/A" if not found
-
-                # Retrieve the product link
-                product_price_after_ivu_series = self.excel_manager.data_frame.loc[self.excel_manager.data_frame['Product ID'] == product_id, 'Product Price After IVU']
-                if not product_price_after_ivu_series.empty:
-                    product_price_after_ivu = product_price_after_ivu_series.iloc[0]
-                else:
-                    product_price_after_ivu = "N/A"  # Default to "N/A" if not found
-
-                # Retrieve the product link
-                order_link_series = self.excel_manager.data_frame.loc[self.excel_manager.data_frame['Product ID'] == product_id, 'Order Link']
-                if not order_link_series.empty:
-                    order_link = order_link_series.iloc[0]
-                else:
-                    order_link = "N/A"  # Default to "N/A"            
-                    
-                # Retrieve the product description
-                product_description_series = self.excel_manager.data_frame.loc[self.excel_manager.data_frame['Product ID'] == product_id, 'Product Description']
-                if not product_description_series.empty and not pd.isna(product_description_series.iloc[0]):
-                    product_description = product_description_series.iloc[0]
-                else:
-                    product_description = "No Product Description At The Moment"
-
-                # Retrieve the comments
-                comments_series = self.excel_manager.data_frame.loc[self.excel_manager.data_frame['Product ID'] == product_id, 'Comments']
-                if not comments_series.empty and not pd.isna(comments_series.iloc[0]):
-                    comments = comments_series.iloc[0]
-                else:
-                    comments = "No Comments Found"
-                    
-                    # Retrieve the product 
-                product_name_series = self.excel_manager.data_frame.loc[self.excel_manager.data_frame['Product ID'] == product_id, 'Product Name']
-                if not product_name_series.empty:
-                    product_name = product_name_series.iloc[0]
-                else:
-                    product_name = "N/A"  # Default to "N/A" 
-
-                    # Retrieve the product 
-                discount_series = self.excel_manager.data_frame.loc[self.excel_manager.data_frame['Product ID'] == product_id, 'Discount']
-                if not discount_series.empty:
-                    discount = discount_series.iloc[0]
-                else:
-                    discount = "N/A"  # Default to "N/A" 
-
-                    # Retrieve the product 
-                discount_percentage_series = self.excel_manager.data_frame.loc[self.excel_manager.data_frame['Product ID'] == product_id, 'Discount Percentage']
-                if not discount_percentage_series.empty:
-                    discount_percentage = discount_percentage_series.iloc[0]
-                else:
-                    discount_percentage = "N/A"  # Default to "N/A" 
-
-            except Exception as e:
-                self.logger.info(f"Error retrieving data: {e}")  # Debugging print statement
-
             # Path for the new Word document named 'Product Information.docx'
             doc_path = os.path.join(folder_path, 'Product Information.docx')
             try:
-                # Create a new Word document
-                doc = Document()
-
-                # Convert all values to strings with appropriate formatting
-                product_id_str = str(product_id)
-                product_name_str = str(product_name) if product_name is not None else "N/A"
-                product_price_str = safe_format_currency(product_price)
-                ivu_tax_str = safe_format_currency(ivu_tax)
-                product_price_after_ivu_str = safe_format_currency(product_price_after_ivu)
-                discount_str = safe_format_currency(discount)
-                discount_percentage_str = safe_format_percentage(discount_percentage)
-                product_description_str = str(product_description) if product_description is not None else "N/A"
-                comments_str = str(comments) if comments is not None else "N/A"
-
-                # Adding styled paragraphs with specified font size
-                add_styled_paragraph(doc, "Product ID: ", product_id_str)
-                add_styled_paragraph(doc, "Product Name: ", product_name_str)
-                doc.add_paragraph("")  # Empty line
-                add_styled_paragraph(doc, "Product Price: ", product_price_str)
-                add_styled_paragraph(doc, "IVU Tax: ", ivu_tax_str)
-                add_styled_paragraph(doc, "Product Price After IVU (Sale Price): ", product_price_after_ivu_str)
-                add_styled_paragraph(doc, "Reseller Earnings : ", f"{discount_str}     [ = {discount_percentage_str} of {product_price_str} (Product Price)]")
-                doc.add_paragraph("")  # Empty line
-                add_styled_paragraph(doc, "Product Description:", "")
-                doc.add_paragraph(product_description_str)
-                doc.add_paragraph("")  # Empty line
-                add_styled_paragraph(doc, "Comments:", "")
-                doc.add_paragraph(comments_str)
-
-                # Uncomment the next line if you want to include the order link
-                # add_styled_paragraph(doc, "Amazon Link (to get the product description and pictures, if needed): ", order_link)
-
-
-                # Save the document
-                doc.save(doc_path)
+                # Fetch the product's row once and read every field from it
+                product_info = self.db_manager.get_product_info(product_id)
+                write_product_document(doc_path, product_document_values(product_id, product_info))
 
                 if show_message:
                     messagebox.showinfo("Document Created", f"Word document for '{product_id}' has been created successfully.")
@@ -804,39 +2569,17 @@ class Application(tk.Frame):
             self.logger.error("Excel database settings not found, correlation aborted")
             return
 
-        # Load the data into the ExcelManager instance
-        self.excel_manager.filepath = filepath  # Set the filepath
-        self.excel_manager.sheet_name = sheet_name  # Set the sheet name
-        self.excel_manager.load_data()  # Load the data
-        
         try:
-            # Load Excel data
-            df = pd.read_excel(filepath, sheet_name=sheet_name)
+            # Load the sheet into the products table
+            self.load_product_store()
             self.logger.info("Excel data loaded successfully")
-            product_ids = df['Product ID'].tolist()
-            #print(f"Product IDs from Excel: {product_ids}")
         except Exception as e:
             messagebox.showerror("Error", f"Unable to load Excel file: {str(e)}")
             self.logger.error(f"Unable to load Excel file: {e}")
 
             return
-            # Filter out nan values from the product_ids list using pandas notnull function
-            
-        # Sort the DataFrame based on 'Product ID'
-        df_sorted = df.sort_values('Product ID').dropna(subset=['Product ID'])
 
-        # Filter out nan values from the product_ids list
-        product_ids = df_sorted['Product ID'].tolist()
-        #print(f"Sorted and Filtered Product IDs from Excel: {product_ids}")
-        
-        missing_docs = []
-        for product_id in product_ids:
-            folder_path = self.get_folder_path_from_db(str(product_id))
-            if folder_path:
-                # Check specifically for 'Product Information.docx' file
-                if not os.path.isfile(os.path.join(folder_path, 'Product Information.docx')):
-                    product_name = df.loc[df['Product ID'] == product_id, 'Product Name'].iloc[0]
-                    missing_docs.append((os.path.basename(folder_path), product_id, product_name))
+        missing_docs = self.find_missing_word_docs(self.db_manager)
 
 
         #print(f"Missing documents: {missing_docs}")
@@ -848,6 +2591,21 @@ class Application(tk.Frame):
             self.logger.info("No missing Word documents found, check complete")
         # Filter out nan values from the product_ids list
 
+    def find_missing_word_docs(self, db_manager):
+        """
+        Returns (folder name, product ID, product name) for every product whose folder has no 
+        'Product Information.docx'.
+        """
+        missing_docs = []
+        # Products come sorted by Product ID from the products table
+        for product_id, product_name in db_manager.get_product_names():
+            folder_path = db_manager.get_product_folder_path(str(product_id))
+            if folder_path:
+                # Check specifically for 'Product Information.docx' file
+                if not os.path.isfile(os.path.join(folder_path, 'Product Information.docx')):
+                    missing_docs.append((os.path.basename(folder_path), product_id, product_name))
+        return missing_docs
+
     def prompt_missing_word_docs(self, missing_docs):
         """
         Opens a window displaying a list of products for which Word documents are missing. 
@@ -886,8 +2644,11 @@ class Application(tk.Frame):
         self.correlate_tree.bind('<Double-1>', self.on_item_double_click)
         
         # Adding a Yes to All button
-        yes_to_all_button = ttk.Button(self.correlate_window, text="Yes to All", command=self.create_all_word_docs)
-        yes_to_all_button.pack()
+        self.yes_to_all_button = ttk.Button(self.correlate_window, text="Yes to All", command=self.create_all_word_docs)
+        self.yes_to_all_button.pack()
+
+        self.word_doc_progress_label = ttk.Label(self.correlate_window, text="")
+        self.word_doc_progress_label.pack()
 
         exit_button = ttk.Button(self.correlate_window, text="Exit", command=self.exit_correlate_window)
         exit_button.pack()
@@ -935,12 +2696,24 @@ class Application(tk.Frame):
             messagebox.showerror("Error", "Excel file path or sheet name is not set.")
             return
 
+        try:
+            self.load_product_store()
+            new_report_path = self.products_to_sell_report_task(self.db_manager, sheet_name)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        self.open_report(new_report_path)
+
+    def products_to_sell_report_task(self, db_manager, sheet_name):
+        """
+        Builds the products to sell report from the products table and returns its path.
+        """
         # Define the To Sell folder path
         to_sell_folder = self.to_sell_folder
-        if not os.path.exists(to_sell_folder):
+        if not to_sell_folder or not os.path.exists(to_sell_folder):
             self.logger.error("To Sell folder path is not set or does not exist")
-            messagebox.showerror("Error", "To Sell folder path is not set or does not exist.")
-            return
+            raise ValueError("To Sell folder path is not set or does not exist.")
 
         # Check for existing folder starting with "- See products added on"
         folder_prefix = "- See products added on "
@@ -964,28 +2737,20 @@ class Application(tk.Frame):
             # Create a new folder
             os.makedirs(new_folder_path)
 
-        self.logger.info("Loading data from the Excel workbook")
-
-        # Load the original workbook and read the specified sheet into a DataFrame
-        workbook = load_workbook(filepath, data_only=True)
-        sheet = workbook[sheet_name]
-        data = sheet.values
-        columns = next(data)[0:]
-        df = pd.DataFrame(data, columns=columns)
-
         # Get the names of the folders in the to_sell_folder and extract product IDs
         folder_names = os.listdir(to_sell_folder)
         folder_product_ids = set(folder_name.split(' ', 1)[0] for folder_name in folder_names)
 
-        self.logger.info("Filtering and processing product data")
+        self.logger.info("Querying products ready to sell from the products table")
 
-        # Filter out unwanted products and keep only necessary columns
-        initial_count = len(df)
-        df = df[(df['Damaged'] != 'YES') & (df['Cancelled Order'] != 'YES') & (df['Personal'] != 'YES') & (df['Sold'] != 'YES') & (~pd.isna(df['Product ID']))]
-        df = df[df['Product ID'].isin(folder_product_ids)]
-        df = df[['Product ID', 'To Sell After', 'Product Name', 'Product Price After IVU']]
-        filtered_count = len(df)
-        self.logger.info(f"Filtered from {initial_count} products to {filtered_count} products")
+        # Unwanted products and future 'To Sell After' dates are filtered by the query
+        report_columns = ['Product ID', 'To Sell After', 'Product Name', 'Product Price After IVU']
+        report_rows = []
+        for record in db_manager.get_products_to_sell(date.today()):
+            if record.get('Product ID') in folder_product_ids:
+                report_rows.append([record.get(column) for column in report_columns])
+        df = pd.DataFrame(report_rows, columns=report_columns)
+        self.logger.info(f"Found {len(df)} products ready to sell in the To Sell folder")
 
         # Convert 'To Sell After' to datetime
         df['To Sell After'] = pd.to_datetime(df['To Sell After'], errors='coerce')
@@ -1080,14 +2845,16 @@ class Application(tk.Frame):
 
         # Call the method to backup old reports
         self.backup_old_reports(new_folder_path, new_report_path)
+        return new_report_path
 
+    def open_report(self, report_path):
         # Open the modified Excel file
         if sys.platform == "win32":
-            os.startfile(new_report_path)
+            os.startfile(report_path)
         elif sys.platform == "darwin":  # macOS
-            subprocess.run(["open", copy_path])
+            subprocess.run(["open", report_path])
         else:  # Linux variants
-            subprocess.run(["xdg-open", copy_path])
+            subprocess.run(["xdg-open", report_path])
 
     def get_previous_excel_report_data(self):
         self.logger.info("Starting to get previous Excel report data")
@@ -1130,9 +2897,8 @@ class Application(tk.Frame):
 
         self.logger.info(f"Previous report found at: {latest_file_path}")
 
-        workbook = load_workbook(latest_file_path, data_only=True)
-        sheet = workbook.active
-        product_ids = [row[0] for row in sheet.iter_rows(min_row=2, values_only=True) if row[0] is not None]
+        # Stream the first column of the previous report
+        product_ids = [values[0] for values in ExcelManager.iter_sheet_columns(latest_file_path, None, [0]) if values[0] is not None]
 
         return set(product_ids), latest_file_date
 
@@ -1533,17 +3299,20 @@ class Application(tk.Frame):
             self.toggle_edit_mode()
 
         # Ensure that the Excel file path and sheet name are set
-        filepath, sheet_name = self.load_excel_path_and_sheet()
-        if filepath and sheet_name:
-            self.excel_manager.filepath = filepath
-            self.excel_manager.sheet_name = sheet_name
-            self.excel_manager.load_data()  # Load the data
+        if self.load_product_store():
 
-            # Retrieve product information from the DataFrame
+            # Retrieve product information from the products table, unless the prefetch prepared it
             try:
-                product_info = self.excel_manager.get_product_info(selected_product_id)
+                details = self.product_details_cache.get(selected_product_id)
+                if details is None:
+                    details = self.load_product_details(self.db_manager, selected_product_id)
+                self.schedule_prefetch(index)
+                product_info = details['product_info']
                 # Right after fetching product_info
-                self.product_folder_path = self.get_folder_path_from_db(selected_product_id)
+                self.product_folder_path = details['folder_path']
+                values = details['values']
+                for error in details['errors']:
+                    messagebox.showerror("Error", error)
 
                 if product_info:
 
@@ -1560,7 +3329,7 @@ class Application(tk.Frame):
                     # For each field, check if the value is NaN using pd.isnull and set it to an empty string if it is
                     self.asin_var.set('' if pd.isnull(product_info.get('ASIN')) else product_info.get('ASIN', ''))
                     self.product_id_var.set('' if pd.isnull(product_info.get('Product ID')) else product_info.get('Product ID', ''))
-                    self.rack_id_var.set(product_info.get('Rack ID', ''))
+                    self.rack_id_var.set('' if pd.isnull(product_info.get('Rack ID')) else product_info.get('Rack ID', ''))
 
 
                     self.product_name_text.configure(state='normal')
@@ -1598,87 +3367,24 @@ class Application(tk.Frame):
                     self.product_description_text.insert("insert", display_product_description_text)
                     self.product_description_text.configure(state='disabled')
 
-                    # When a product is selected and the order date is fetched
-                    order_date = product_info.get('Order Date', '')
-                    formatted_order_date = ''  # Default value
-                    if isinstance(order_date, datetime):
-                        formatted_order_date = order_date.strftime('%m/%d/%Y')
-                        self.order_date_var.set(formatted_order_date)
-                    elif isinstance(order_date, str) and order_date:
-                        try:
-                            # If the date is in the format 'mm/dd/yy', such as '2/15/23'
-                            order_date = datetime.strptime(order_date, "%m/%d/%Y")
-                            formatted_order_date = order_date.strftime('%m/%d/%Y')
-                            self.order_date_var.set(formatted_order_date)
-                        except ValueError as e:
-                            
-                            messagebox.showerror("Error", f"Incorrect date format: {e}")
-                    else:
-                        self.order_date_var.set('')
-                    self.order_date_var.set(formatted_order_date)
-                    
-                    # When a product is selected and the order date is fetched
-                    to_sell_after = product_info.get('To Sell After', '')
-                    formatted_to_sell_after = ''  # Default value
-                    if pd.notnull(to_sell_after):  # Check if 'To Sell After' is not null
-                        try:
-                            if isinstance(to_sell_after, datetime):
-                                formatted_to_sell_after = to_sell_after.strftime('%m/%d/%Y')
-                            elif isinstance(to_sell_after, str) and to_sell_after:
-                                to_sell_after = datetime.strptime(to_sell_after, "%m/%d/%Y")
-                                formatted_to_sell_after = to_sell_after.strftime('%m/%d/%Y')
-                        except ValueError as e:
-                            messagebox.showerror("Error", f"Incorrect date format: {e}")
-                    self.to_sell_after_var.set(formatted_to_sell_after)
+                    self.order_date_var.set(values['Order Date'])
+                    self.to_sell_after_var.set(values['To Sell After'])
                     self.update_to_sell_after_color()
-                    
-                    sold_date = product_info.get('Sold Date', '')
-                    formatted_sold_date = ''  # Default value
-
-                    if pd.notnull(sold_date):  # Check if 'Sold Date' is not null
-                        try:
-                            if isinstance(sold_date, datetime):
-                                formatted_sold_date = sold_date.strftime('%m/%d/%Y')
-                            elif isinstance(sold_date, str) and sold_date:
-                                # Parse the date string to a date object and format it
-                                sold_date = datetime.strptime(sold_date, "%m/%d/%Y").date()
-                                formatted_sold_date = sold_date.strftime('%m/%d/%Y')
-                        except ValueError as e:
-                            messagebox.showerror("Error", f"Incorrect date format: {e}")
-                    else:
-                        formatted_sold_date = ''
+                    self.sold_date_var.set(values['Sold Date'])
 
-                    self.sold_date_var.set(formatted_sold_date)
+                    self.fair_market_value_var.set(values['Fair Market Value'])
+                    self.discount_var.set(values['Discount'])
+                    self.percent_discount_var.set(values['Discount Percentage'])
 
-                    def format_price(value):
-                        if pd.isnull(value):
-                            return ''
-                        # Separate the fractional and integer parts
-                        fractional, integer = math.modf(value)
-                        # If the fractional part is 0, use the integer part; otherwise, format with two decimal places
-                        return f"${int(integer) if fractional == 0 else f'{value:.2f}'}"
+                    self.regular_product_price_var.set(values['Product Price'])
+                    self.ivu_tax_var.set(values['IVU Tax'])
+                    self.product_price_plus_ivu_var.set(values['Product Price After IVU'])
 
-                    def format_percentage(value):
-                        if pd.isnull(value):
-                            return ''
-                        # Separate the fractional and integer parts
-                        fractional, integer = math.modf(value)
-                        # If the fractional part is 0, use the integer part; otherwise, format with two decimal places
-                        return f"{int(integer) if fractional == 0 else f'{value:.2f}'}%"
+                    self.product_price_after_discount_var.set(values['Product Price After Discount'])
+                    self.ivu_tax_after_discount_var.set(values['IVU Tax After Discount'])
+                    self.product_price_minus_discount_plus_ivu_var.set(values['Product Price After IVU and Discount'])
 
-                    self.fair_market_value_var.set(format_price(product_info.get('Fair Market Value')))
-                    self.discount_var.set(format_price(product_info.get('Discount')))
-                    self.percent_discount_var.set(format_percentage(product_info.get('Discount Percentage')))
-
-                    self.regular_product_price_var.set(format_price(product_info.get('Product Price')))
-                    self.ivu_tax_var.set(format_price(product_info.get('IVU Tax')))
-                    self.product_price_plus_ivu_var.set(format_price(product_info.get('Product Price After IVU')))
-
-                    self.product_price_after_discount_var.set(format_price(product_info.get('Product Price After Discount')))
-                    self.ivu_tax_after_discount_var.set(format_price(product_info.get('IVU Tax After Discount')))
-                    self.product_price_minus_discount_plus_ivu_var.set(format_price(product_info.get('Product Price After IVU and Discount')))
-
-                    self.sold_price_var.set(format_price(product_info.get('Sold Price')) if not pd.isnull(product_info.get('Sold Price')) else '')
+                    self.sold_price_var.set(values['Sold Price'])
 
                     self.order_link_text.delete(1.0, "end")
                     hyperlink = product_info.get('Order Link', '')
@@ -1690,15 +3396,15 @@ class Application(tk.Frame):
                     # ... continue with other fields as needed ...
                     # Add code here to populate the Sold Date and other date-related fields, if applicable
                     
-                    # Fetch the full folder path from the database using the product ID.
-                    folder_path = self.get_folder_path_from_db(selected_product_id)
+                    # The full folder path from the database using the product ID.
+                    folder_path = details['folder_path']
 
                     # Extract the name of the parent directory (where the product folder is located)
                     parent_folder_name = os.path.basename(os.path.dirname(folder_path)) if folder_path else "No Folder"
                     self.product_folder_var.set(parent_folder_name)
 
                     # If the folder path exists, update the button to open the product folder when clicked
-                    if folder_path and os.path.exists(folder_path):
+                    if details['folder_exists']:
                         self.product_folder_link.config(command=lambda: self.open_product_folder(folder_path), state='normal')
                     else:
                         self.product_folder_var.set("No Folder")
@@ -1713,7 +3419,7 @@ class Application(tk.Frame):
                             product_image_col_num = col_num
                             break
                     # 2. Get the current row number
-                    current_row_num = self.excel_manager.data_frame[self.excel_manager.data_frame['Product ID'].str.upper() == selected_product_id.upper()].index[0]
+                    current_row_num = self.excel_manager.get_row_position(selected_product_id)
   
                     # 3. Print the column name and row number
                     if product_image_col_num is not None:
@@ -1768,15 +3474,15 @@ class Application(tk.Frame):
                     self.payment_type_var.set('')
                     self.sold_date_var.set('')
 
-                    # Fetch the full folder path from the database using the product ID.
-                    folder_path = self.get_folder_path_from_db(selected_product_id)
+                    # The full folder path from the database using the product ID.
+                    folder_path = details['folder_path']
 
                     # Extract the name of the parent directory (where the product folder is located)
                     parent_folder_name = os.path.basename(os.path.dirname(folder_path)) if folder_path else "No Folder"
                     self.product_folder_var.set(parent_folder_name)
 
                     # If the folder path exists, update the button to open the product folder when clicked
-                    if folder_path and os.path.exists(folder_path):
+                    if details['folder_exists']:
                         self.product_folder_link.config(command=lambda: self.open_product_folder(folder_path), state='normal')
                     else:
                         self.product_folder_var.set("No Folder")
@@ -1799,6 +3505,140 @@ class Application(tk.Frame):
         self.master.bind('<Return>', self.edit_on_key_handler)
         self.logger.info("Completed displaying product details")
 
+    def load_product_details(self, db_manager, product_id):
+        """
+        Gathers what display_product_details shows for a product: its record from the products 
+        table, the formatted dates and prices, its folder path and where its image is in the sheet. 
+        It doesn't touch Tk, so the prefetch thread can call it with its own db_manager.
+        """
+        product_info = db_manager.get_product_info(product_id)
+        folder_path = db_manager.get_product_folder_path(product_id)
+        values, errors = self.format_product_values(product_info or {})
+
+        image_location = None
+        data_frame = self.excel_manager.data_frame
+        row_position = self.excel_manager.get_row_position(product_id)
+        if data_frame is not None and row_position is not None and 'Product Image' in data_frame.columns:
+            image_location = (row_position + 1, list(data_frame.columns).index('Product Image'))
+
+        return {'product_info': product_info, 'folder_path': folder_path,
+                'folder_exists': bool(folder_path and os.path.exists(folder_path)),
+                'values': values, 'errors': errors, 'image_location': image_location}
+
+    @staticmethod
+    def format_product_values(product_info):
+        """
+        Formats the dates and prices of a product record for the product form. Returns the 
+        formatted values by column and the messages of dates that couldn't be read.
+        """
+        values, errors = {}, []
+
+        def format_date(column, value, parse):
+            formatted = ''  # Default value
+            if value is None or pd.isnull(value):
+                pass
+            elif isinstance(value, datetime):
+                formatted = value.strftime('%m/%d/%Y')
+            elif isinstance(value, str) and value:
+                try:
+                    # If the date is in the format 'mm/dd/yyyy', such as '2/15/2023'
+                    formatted = parse(value).strftime('%m/%d/%Y')
+                except ValueError as e:
+                    errors.append(f"Incorrect date format: {e}")
+            values[column] = formatted
+
+        format_date('Order Date', product_info.get('Order Date', ''), lambda text: datetime.strptime(text, "%m/%d/%Y"))
+        format_date('To Sell After', product_info.get('To Sell After', ''), lambda text: datetime.strptime(text, "%m/%d/%Y"))
+        format_date('Sold Date', product_info.get('Sold Date', ''), lambda text: datetime.strptime(text, "%m/%d/%Y").date())
+
+        def format_price(value):
+            if pd.isnull(value):
+                return ''
+            # Separate the fractional and integer parts
+            fractional, integer = math.modf(value)
+            # If the fractional part is 0, use the integer part; otherwise, format with two decimal places
+            return f"${int(integer) if fractional == 0 else f'{value:.2f}'}"
+
+        def format_percentage(value):
+            if pd.isnull(value):
+                return ''
+            # Separate the fractional and integer parts
+            fractional, integer = math.modf(value)
+            # If the fractional part is 0, use the integer part; otherwise, format with two decimal places
+            return f"{int(integer) if fractional == 0 else f'{value:.2f}'}%"
+
+        for column in ['Fair Market Value', 'Discount', 'Product Price', 'IVU Tax', 'Product Price After IVU',
+                       'Product Price After Discount', 'IVU Tax After Discount', 'Product Price After IVU and Discount', 'Sold Price']:
+            values[column] = format_price(product_info.get(column))
+        values['Discount Percentage'] = format_percentage(product_info.get('Discount Percentage'))
+        return values, errors
+
+    def schedule_prefetch(self, index):
+        """
+        Prepares the products around the selected list entry in the background: their details 
+        and thumbnails, PREFETCH_NEIGHBOURS on each side first, then PREFETCH_AHEAD more in the 
+        direction the list is walked with the arrow keys. A new selection stops the previous prefetch.
+        """
+        self.prefetch_generation += 1
+        if self.prefetch_future is not None:
+            self.prefetch_future.cancel()
+
+        direction = self.browse_direction or 1
+        positions = []
+        for distance in range(1, PREFETCH_NEIGHBOURS + 1):
+            positions += [index + direction * distance, index - direction * distance]
+        if self.browse_direction:
+            positions += [index + direction * distance
+                          for distance in range(PREFETCH_NEIGHBOURS + 1, PREFETCH_NEIGHBOURS + PREFETCH_AHEAD + 1)]
+        size = self.folder_list.size()
+        product_ids = [self.folder_list.get(position).split(' ')[0].upper() for position in positions if 0 <= position < size]
+        self.prefetch_future = self.prefetch_executor.submit(
+            self.prefetch_task, self.prefetch_generation, self.product_details_version, product_ids)
+
+    def prefetch_task(self, generation, version, product_ids):
+        """
+        Prefetch thread part of schedule_prefetch. Each product's details are handed to the Tk 
+        thread as soon as they're ready, and its thumbnail is loaded into the image cache.
+        """
+        try:
+            if self.prefetch_db_manager is None:
+                self.prefetch_db_manager = DatabaseManager()
+            fingerprint = self.excel_manager.workbook_fingerprint()
+            for product_id in product_ids:
+                if not self.running or generation != self.prefetch_generation:
+                    return  # Another product was selected
+                details = self.product_details_cache.get(product_id)
+                if details is None:
+                    details = self.load_product_details(self.prefetch_db_manager, product_id)
+                    self.after(0, lambda product_id=product_id, details=details: self.store_product_details(version, product_id, details))
+                if fingerprint and details['image_location']:
+                    self.get_thumbnail(fingerprint, *details['image_location'])
+        except Exception as e:
+            self.logger.error(f"Error prefetching product details: {e}")
+
+    def close_prefetch_connection(self):
+        """
+        Closes the prefetch thread's connection. Submitted to the prefetch pool, so it runs on that thread.
+        """
+        if self.prefetch_db_manager is not None:
+            self.prefetch_db_manager.conn.close()
+            self.prefetch_db_manager = None
+
+    def store_product_details(self, version, product_id, details):
+        if version != self.product_details_version:
+            return  # Products or folders changed since the details were read
+        self.product_details_cache[product_id] = details
+        self.product_details_cache.move_to_end(product_id)
+        while len(self.product_details_cache) > PREFETCH_CACHE_SIZE:
+            self.product_details_cache.popitem(last=False)
+
+    def invalidate_product_details(self):
+        """
+        Drops the prepared product details after products or folders changed.
+        """
+        self.product_details_version += 1
+        self.product_details_cache.clear()
+
     def refresh_and_select_product(self, product_id):
         """
         Refreshes the list of products and selects the specified product. 
@@ -1810,20 +3650,13 @@ class Application(tk.Frame):
 
         # Refresh the list of products
         self.combine_and_display_folders()
-        
-        # Convert the product_id to uppercase for case-insensitive comparison
-        product_id_upper = product_id.upper()
 
         # Log after refreshing the list
         self.logger.info("Product list refreshed")
 
-        # Find the index of the product that was just edited
-        product_index = None
-        for index, product_name in enumerate(self.folder_list.get(0, tk.END)):
-            # Use .split() to get the first part of the folder name and compare it in uppercase
-            if product_name.split()[0].upper() == product_id_upper:
-                product_index = index
-                break
+        # Find the index of the product that was just edited, folders are mapped by the first 
+        # part of their name in upper case for a case-insensitive comparison
+        product_index = self.folder_order.position_of_product(product_id)
         
         # If the product is found in the list, select it
         if product_index is not None:
@@ -2462,115 +4295,160 @@ class Application(tk.Frame):
 
     def load_and_display_image(self, current_row_num, product_image_col_num, product_id):
         """
-        Loads and displays the product image in a separate thread. The image is fetched from the 
-        Excel workbook based on the row and column numbers. If the image is not in the cache, it 
-        is loaded from the workbook, cached, and then displayed.
+        Loads and displays the product image on the image worker pool. The thumbnail of this state 
+        of the workbook and the row and column numbers is taken from the image cache or the 
+        thumbnail store if there is one. Otherwise the image is read from the workbook, its 
+        thumbnail is stored, and then displayed. Every call supersedes the previous one, so 
+        only the image of the latest selection is loaded and shown.
         """
-        # Before starting the thread for loading the image
-        self.logger.info(f"Starting thread to load image for product ID: {product_id}")
+        self.image_generation += 1
+        generation = self.image_generation
+        if self.image_future is not None:
+            self.image_future.cancel()  # Only succeeds if it hasn't started yet
 
-        def task():
-            self.logger.info(f"Starting image loading task: Row {current_row_num}, Column {product_image_col_num}")
+        # Before queuing the image request
+        self.logger.info(f"Queuing image request for product ID: {product_id}")
+        self.image_future = self.image_executor.submit(
+            self.load_image_task, generation, current_row_num, product_image_col_num, product_id)
 
-            if not self.running or self.current_product_id != product_id:
-                self.logger.info("Task exited: Application no longer running or product changed")
-                return
-            wb = None
-            try:
-                image_data = self.get_image_data(current_row_num, product_image_col_num)
-                if not image_data:
-                    # Image not in cache, load from workbook and cache it
-                    wb = self.load_workbook_cached(self.excel_manager.filepath)
-                    sheet = wb[self.excel_manager.sheet_name]
-                    for image in sheet._images:
-                        if image.anchor._from.row == current_row_num and image.anchor._from.col == product_image_col_num:
-                            image_data = image._data()
-                            self.image_cache[(current_row_num, product_image_col_num)] = image_data
-                            # Log when image is found and cached
-                            self.logger.info("Image found and cached")
-                            break
-                    wb.close()
-
-                if image_data:
-                    # Load image from cached data
-                    with io.BytesIO(image_data) as image_stream:
-                        pil_image = Image.open(image_stream)
-                        # Resize the image using PIL
-                        desired_size = (100, 100)
-                        resized_image = pil_image.resize(desired_size)
-                        # Convert the resized image to Tkinter PhotoImage
-
-                    if self.running and self.current_product_id == product_id:
-                        self.logger.info("Scheduling image update in main thread")
-                        self.after(0, lambda: self.update_image_label(resized_image))
-                    else:
-                        self.logger.error("Skipped image update: Application no longer running or product changed")
-                else:
-                    self.logger.error("Image not found in workbook or cache")
-                    if self.running and self.current_product_id == product_id:
-                        self.after(0, lambda: self.product_image_label.config(text="Product image not found"))
-
-            except Exception as e:
-                self.logger.error(f"Error loading image: {e}")
-                if self.running and self.current_product_id == product_id:
-                    self.after(0, lambda: self.product_image_label.config(text="Error loading image"))
-            finally:
-                if wb:
-                    wb.close()
-                    self.logger.info("Workbook closed in thread")
-
-        threading.Thread(target=task).start()
+    def is_current_image_request(self, generation, product_id):
+        return self.running and generation == self.image_generation and self.current_product_id == product_id
 
-    def load_workbook_cached(self, path):
+    def load_image_task(self, generation, current_row_num, product_image_col_num, product_id):
         """
-        Loads an Excel workbook from the given path with caching. 
-        If the workbook at the same path is already loaded, it uses the cached version instead 
-        of reloading it. This improves performance by avoiding redundant loading of the same workbook.
+        Worker part of load_and_display_image. Requests that were superseded are dropped before 
+        and after reading the image.
         """
-        self.logger.info(f"Loading workbook from path: {path}")
+        if not self.is_current_image_request(generation, product_id):
+            self.logger.info("Image request dropped: Application no longer running or a newer product was selected")
+            return
 
-        # Check if the path is different from the cached path or the cache is None
-        if path != self.workbook_path or self.workbook_cache is None:
-            # Load the workbook and update the cache
-            try:
-                self.workbook_cache = openpyxl.load_workbook(path, data_only=True)
-                self.workbook_path = path
-                self.logger.info("Workbook loaded and cached")
-            except Exception as e:
-                self.logger.error(f"Error loading workbook from path {path}: {e}")
-                raise
+        self.logger.info(f"Starting image loading task: Row {current_row_num}, Column {product_image_col_num}")
+        try:
+            fingerprint = self.excel_manager.workbook_fingerprint()
+            resized_image = self.get_thumbnail(fingerprint, current_row_num, product_image_col_num)
+            if not self.is_current_image_request(generation, product_id):
+                self.logger.info("Skipped image update: Application no longer running or a newer product was selected")
+            elif resized_image is not None:
+                self.logger.info("Scheduling image update in main thread")
+                self.after(0, lambda: self.show_product_image(generation, product_id, resized_image))
+            else:
+                self.logger.error(f"Image not found in workbook or cache for product ID: {product_id}")
+                self.after(0, lambda: self.show_product_image(generation, product_id, None, "Product image not found"))
+
+        except Exception as e:
+            self.logger.error(f"Error loading image: {e}")
+            if self.is_current_image_request(generation, product_id):
+                self.after(0, lambda: self.show_product_image(generation, product_id, None, "Error loading image"))
 
-        return self.workbook_cache
+    def show_product_image(self, generation, product_id, pil_image, message=None):
+        # Another product may have been selected while this waited for the event loop
+        if not self.is_current_image_request(generation, product_id):
+            return
+        if pil_image is not None:
+            self.update_image_label(pil_image)
+        else:
+            self.product_image_label.config(text=message)
 
-    def cache_images(self, workbook_path, sheet_name):
+    def get_thumbnail(self, fingerprint, row, col):
+        """
+        Returns the display-size image of the picture at (row, col) in the given state of the 
+        workbook, or None if there is none. It comes from the image cache or the thumbnail store, 
+        or the picture is read and its thumbnail stored.
         """
-        Loads images from a specified Excel sheet and caches them. 
-        Each image is associated with its cell position (row and column) in the sheet.
+        key = ('thumbnail', fingerprint, row, col)
+        thumbnail = self.image_cache.get(key) if fingerprint else None
+        if thumbnail is not None:
+            return thumbnail
+
+        thumbnail_path = self.thumbnail_store.lookup(fingerprint, row, col) if fingerprint else None
+        if thumbnail_path is None:
+            image_data = self.get_image_data(fingerprint, row, col)
+            if not image_data:
+                return None
+            if not fingerprint or self.excel_manager.workbook_fingerprint() != fingerprint:
+                # The workbook changed while the image was read, show it without storing it
+                return self.thumbnail_store.make_thumbnail(image_data)
+            thumbnail_path = self.thumbnail_store.store(fingerprint, row, col, image_data)
+
+        thumbnail = self.thumbnail_store.open(thumbnail_path)
+        self.image_cache.put(key, thumbnail, thumbnail.width * thumbnail.height * len(thumbnail.getbands()))
+        return thumbnail
+
+    def get_image_data(self, fingerprint, row, col):
         """
-        self.logger.info(f"Caching images from workbook '{workbook_path}', sheet '{sheet_name}'")
+        Returns the bytes of the picture at (row, col) in the given state of the workbook, from the 
+        image cache, the xlsx package, or the sheet loaded with openpyxl if the package can't be read.
+        """
+        key = ('image', fingerprint, row, col)
+        image_data = self.image_cache.get(key)
+        if image_data is not None:
+            return image_data
 
-        wb = None
         try:
-            wb = openpyxl.load_workbook(workbook_path, data_only=True)
-            sheet = wb[sheet_name]
+            image_data = self.get_image_reader(fingerprint).read(row, col)
+        except Exception as e:
+            self.logger.error(f"Unable to read the image from the xlsx package, loading the workbook instead: {e}")
+            image_data = self.read_sheet_image(self.excel_manager.filepath, fingerprint, row, col)
 
-            for image in sheet._images:
-                row, col = image.anchor._from.row, image.anchor._from.col
-                key = (row, col)
-                self.logger.info(f"Caching image at row {row}, column {col}")
-                self.image_cache[key] = image._data()
+        if image_data:
+            self.image_cache.put(key, image_data, len(image_data))
+            self.logger.info("Image found and cached")
+        return image_data
 
-            self.logger.info("Finished caching images")
-        except Exception as e:
-            self.logger.error(f"Error caching images from workbook: {e}")
-        finally:
-            if wb:
-                wb.close()
-                self.logger.info("Workbook closed after caching images")
+    def get_image_reader(self, fingerprint):
+        """
+        Returns the XlsxImageReader of the given workbook state, building its anchor map only 
+        when the workbook changed since the last image was read.
+        """
+        with self.image_reader_lock:
+            if self.image_reader is None or self.image_reader_fingerprint != fingerprint:
+                self.image_reader = XlsxImageReader(self.excel_manager.filepath, self.excel_manager.sheet_name)
+                self.image_reader_fingerprint = fingerprint
+            return self.image_reader
+
+    def read_sheet_image(self, path, fingerprint, row, col):
+        """
+        Returns the bytes of the picture at (row, col), for when the xlsx package can't be read 
+        directly. The workbook is loaded with openpyxl and all its pictures are put in the image 
+        cache, where they count against its budget like any other picture; only their anchors are 
+        kept here. A picture evicted from the cache is read by loading the workbook again.
+        """
+        with self.workbook_load_lock:
+            key = ('image', fingerprint, row, col)
+            image_data = self.image_cache.get(key)
+            if image_data is not None:
+                return image_data
+            if self.sheet_image_anchors_fingerprint == fingerprint and (row, col) not in self.sheet_image_anchors:
+                return None
+
+            self.logger.info(f"Loading workbook from path: {path}")
+            try:
+                wb = openpyxl.load_workbook(path, data_only=True)
+            except Exception as e:
+                self.logger.error(f"Error loading workbook from path {path}: {e}")
+                raise
+            anchors = set()
+            for image in wb[self.excel_manager.sheet_name]._images:
+                anchor = getattr(image.anchor, '_from', None)
+                if anchor is None or (anchor.row, anchor.col) in anchors:
+                    continue  # Absolute anchors aren't tied to a cell, and the first picture wins like the sheet scan did
+                anchors.add((anchor.row, anchor.col))
+                data = self.read_openpyxl_image(image)
+                if (anchor.row, anchor.col) == (row, col):
+                    image_data = data  # Kept even if the other pictures evict it from the cache
+                self.image_cache.put(('image', fingerprint, anchor.row, anchor.col), data, len(data))
+            wb.close()
+            self.sheet_image_anchors, self.sheet_image_anchors_fingerprint = anchors, fingerprint
+            self.logger.info(f"Mapped {len(anchors)} images of the workbook")
+            return image_data
 
-    def get_image_data(self, row, col):
-        key = (row, col)
-        return self.image_cache.get(key, None)
+    @staticmethod
+    def read_openpyxl_image(image):
+        # image._data() closes the picture's stream, so it could only be read once
+        if isinstance(image.ref, io.BytesIO):
+            return image.ref.getvalue()
+        return image._data()
 
     def update_image_label(self, pil_image):
         if self.running:
@@ -2801,7 +4679,11 @@ class Application(tk.Frame):
         # Use the ExcelManager method to save the data.
         try:
             self.logger.info("Attempting to save data to Excel")
-            self.excel_manager.save_product_info(product_id, product_data)
+            # The edit is journaled first and written to the workbook in the background
+            self.edit_journal.append(product_id, product_data)
+            self.excel_manager.update_cached_product(product_id, product_data)
+            self.store_cached_product(product_id)
+            self.schedule_journal_flush()
             messagebox.showinfo("Success", "Product information updated successfully.")
             self.logger.info("Product information updated successfully in Excel")
         except Exception as e:
@@ -2902,11 +4784,7 @@ class Application(tk.Frame):
         # Log before executing the database query
         self.logger.info(f"Fetching folder path for product ID: {product_id} from the database")
 
-        self.db_manager.cur.execute("SELECT Path FROM folder_paths WHERE Folder LIKE ?", (product_id + ' %',))
-        result = self.db_manager.cur.fetchone()
-
-
-        return result[0] if result else None
+        return self.db_manager.get_product_folder_path(product_id)
 
 
     def get_folder_names_from_db(self):
@@ -2951,6 +4829,7 @@ class Application(tk.Frame):
                 self.excel_manager.sheet_name = sheet_names[0]  # Save the sheet name to the ExcelManager instance
                 self.save_excel_settings(filepath, sheet_names[0])  # Save settings
                 self.excel_manager.load_data()  # Load the data
+                self.sync_product_store()
                 self.update_excel_label()  # Update the label
                 self.logger.info(f"Excel sheet selected and data loaded: {sheet_names[0]}")
         xls = pd.ExcelFile(filepath) # delete ?
@@ -3040,6 +4919,7 @@ class Application(tk.Frame):
         self.excel_manager.filepath = filepath
         self.excel_manager.sheet_name = selected_sheet
         self.excel_manager.load_data()
+        self.sync_product_store()
         self.update_excel_label()
         self.save_excel_settings(filepath, selected_sheet)
 
@@ -3274,23 +5154,43 @@ class Application(tk.Frame):
         self.logger.info("Starting the process to update Excel file")
         
         try:
-            with open('excel_and_sheet_path.txt', 'r') as file:
-                lines = file.readlines()
-                excel_path = lines[0].strip()
-                sheet_name = lines[1].strip()
+            if not self.update_excel_data_task():
+                messagebox.showerror("Error", "Necessary columns not found.")
+                return
+
+            messagebox.showinfo("Success", "Excel file has been updated.")
+
+        except Exception as e:
+            self.logger.error(f"An error occurred: {e}")
+            messagebox.showerror("Error", f"An error occurred: {e}")
+
+        self.combine_and_display_folders()
+        self.logger.info("Additional database operations completed")
 
+    def update_excel_data_task(self):
+        """
+        Fills in the empty order links, ASINs and 'To Sell After' dates in the workbook. 
+        Returns False if columns are missing.
+        """
+        self.flush_edit_journal()  # Write pending edits before the workbook is rewritten
+
+        with open('excel_and_sheet_path.txt', 'r') as file:
+            lines = file.readlines()
+            excel_path = lines[0].strip()
+            sheet_name = lines[1].strip()
+
+        with self.excel_manager.workbook_lock:
             workbook = openpyxl.load_workbook(excel_path)
             sheet = workbook[sheet_name]
 
             self.logger.info("Excel workbook loaded")
 
             # Find the index of the columns
-            col_indexes = self.find_column_indexes(sheet, ['Product Name', 'Order Link', 'ASIN', 'Order Date', 'To Sell After'])
+            col_indexes = self.find_column_indexes(sheet, excel_path, ['Product Name', 'Order Link', 'ASIN', 'Order Date', 'To Sell After'])
 
             if not all(col_indexes.values()):
                 self.logger.error("Necessary columns not found.")
-                messagebox.showerror("Error", "Necessary columns not found.")
-                return
+                return False
 
             # Update process
             for row in sheet.iter_rows(min_row=2, max_row=sheet.max_row):
@@ -3299,19 +5199,12 @@ class Application(tk.Frame):
                 self.update_row_to_sell_after(row, col_indexes)
 
             workbook.save(excel_path)
-            messagebox.showinfo("Success", "Excel file has been updated.")
-            self.logger.info("Excel file updated successfully")
+        self.logger.info("Excel file updated successfully")
+        return True
 
-        except Exception as e:
-            self.logger.error(f"An error occurred: {e}")
-            messagebox.showerror("Error", f"An error occurred: {e}")
-
-        self.combine_and_display_folders()
-        self.logger.info("Additional database operations completed")
-
-    def find_column_indexes(self, sheet, column_names):
-        header_row = sheet[1]
-        return {col_name: next((i + 1 for i, cell in enumerate(header_row) if cell.value == col_name), None) for col_name in column_names}
+    def find_column_indexes(self, sheet, workbook_path, column_names):
+        layout = self.excel_manager.get_sheet_layout(sheet, workbook_path)
+        return {col_name: layout['columns'].get(col_name) for col_name in column_names}
 
     def update_row_links(self, row, col_indexes):
         product_name_cell = row[col_indexes['Product Name'] - 1]
@@ -3333,10 +5226,16 @@ class Application(tk.Frame):
             to_sell_after_cell.value = order_date_cell.value + relativedelta(months=+6)
 
     def update_all_folder_paths_and_names(self):
-        # Load Excel data
-        filepath, sheet_name = self.load_excel_path_and_sheet()
-        df = pd.read_excel(filepath, sheet_name)  # Replace with the actual path to your Excel file
+        # Load Excel data into the products table
+        self.load_product_store()
+        self.move_product_folders_task(self.db_manager)
+        messagebox.showinfo("Folder Moved", f"Folders moved successfully to the new location.")
+        self.combine_and_display_folders()
 
+    def move_product_folders_task(self, db_manager):
+        """
+        Moves every product folder to the folder matching its status in the products table.
+        """
         # Define all folder paths
         folder_paths = {
             "Inventory": self.inventory_folder,
@@ -3358,14 +5257,14 @@ class Application(tk.Frame):
                 if os.path.isdir(full_path):
                     product_id = folder_name.split(' ')[0].upper()
 
-                    # Find matching row in Excel
-                    row = df[df['Product ID'].str.upper() == product_id]
-                    if not row.empty:
+                    # Find matching product record
+                    record = db_manager.get_product_info(product_id)
+                    if record:
                         # Extract product name
-                        product_name = row['Product Name'].iloc[0]
+                        product_name = record.get('Product Name')
 
                         # Decide target folder based on Excel data
-                        target_folder_path = self.get_target_folder_path(row, folder_paths)
+                        target_folder_path = self.get_target_folder_path(record, folder_paths)
 
                         if target_folder_path and full_path != target_folder_path:
                             try:
@@ -3375,26 +5274,24 @@ class Application(tk.Frame):
                                 # Save the new folder path in the database
                                 new_folder_name = os.path.basename(new_folder_path).strip()  # Extract folder name from the path
 
-                                self.db_manager.delete_folder_path(folder_name)
+                                db_manager.delete_folder_path(folder_name)
 
-                                self.db_manager.save_folder_path(new_folder_name, new_folder_path)
+                                db_manager.save_folder_path(new_folder_name, new_folder_path)
 
                                 #print(f"Folder for '{product_id}' moved from {current_folder_path} to {new_folder_path}")
                             except Exception as e:
                                 # Optional: Log or show error message
                                 pass
-        messagebox.showinfo("Folder Moved", f"Folders moved successfully to the new location.")
-        self.combine_and_display_folders()
 
-    def get_target_folder_path(self, row, folder_paths):
-        if row['Sold'].iloc[0] == 'YES':
+    def get_target_folder_path(self, record, folder_paths):
+        if record.get('Sold') == 'YES':
             return folder_paths['Sold']
-        elif row['Damaged'].iloc[0] == 'YES':
+        elif record.get('Damaged') == 'YES':
             return folder_paths['Damaged']
-        elif row['Personal'].iloc[0] == 'YES':
+        elif record.get('Personal') == 'YES':
             return folder_paths['Personal']
         else:
-            to_sell_after = row['To Sell After'].iloc[0]
+            to_sell_after = record.get('To Sell After')
             if pd.notnull(to_sell_after):
                 # Check if 'to_sell_after' is already a datetime object
                 if isinstance(to_sell_after, datetime):
@@ -3544,6 +5441,33 @@ class Application(tk.Frame):
 
         return regular_product_price, total_price, IVU_tax, price_discount
 
+    @staticmethod
+    def rpc_formula_cents(fair_market_cents):
+        """
+        Batch version of rpc_formula for an int64 array of non-negative fair market values in cents.
+        Each Decimal quantize with ROUND_HALF_UP becomes a floor division with half the divisor added, 
+        so the results match rpc_formula to the cent. Returns the regular product price, total price, 
+        IVU tax, discount, price after discount, IVU tax after discount and price after IVU and discount, in cents.
+        """
+        fair_market_cents = np.asarray(fair_market_cents, dtype=np.int64)
+
+        # value / (1 - 0.115) == value * 200 / 177
+        original_value = (400 * fair_market_cents + 177) // 354
+        # Same as rpc_formula, whose Decimal floor division truncates: the $5 step at or below the value
+        total_price = original_value // 500 * 500
+        # total / (1 + 0.115) == total * 200 / 223
+        regular_product_price = (400 * total_price + 223) // 446
+        IVU_tax = (23 * regular_product_price + 100) // 200  # 11.5%
+        price_discount = (regular_product_price + 5) // 10  # 10%
+        total_price = regular_product_price + IVU_tax
+
+        product_price_after_discount = regular_product_price - price_discount
+        ivu_tax_after_discount = (23 * product_price_after_discount + 100) // 200
+        product_price_plus_ivu_discount = product_price_after_discount + ivu_tax_after_discount
+
+        return (regular_product_price, total_price, IVU_tax, price_discount,
+                product_price_after_discount, ivu_tax_after_discount, product_price_plus_ivu_discount)
+
     def update_prices(self):
         """
         Updates the prices in the Excel sheet based on the calculated values using the RPC formula. 
@@ -3554,10 +5478,24 @@ class Application(tk.Frame):
         self.logger.info("Starting the process to update prices in the Excel file")
 
         try:
-            # Read the Excel path and sheet name from the file
-            with open('excel_and_sheet_path.txt', 'r') as file:
-                excel_path, sheet_name = file.read().strip().split('\n')
+            self.update_prices_task()
+            messagebox.showinfo("Success", "Prices updated successfully in the Excel file.")
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred while updating prices: {e}")
+            # Log the error encountered during the price update process
+            self.logger.error(f"Error updating prices in Excel: {e}")
+
+    def update_prices_task(self):
+        """
+        Calculates the prices of the products that are missing them and writes them to the workbook.
+        """
+        self.flush_edit_journal()  # Write pending edits before the workbook is rewritten
+
+        # Read the Excel path and sheet name from the file
+        with open('excel_and_sheet_path.txt', 'r') as file:
+            excel_path, sheet_name = file.read().strip().split('\n')
             
+        with self.excel_manager.workbook_lock:
             # Load the workbook and the specific sheet
             workbook = load_workbook(excel_path)
             sheet = workbook[sheet_name]
@@ -3593,46 +5531,78 @@ class Application(tk.Frame):
                     except ValueError:
                         return 0  # or some other sensible default value
                 return value
-            # Iterate through the DataFrame and update the prices
-            for index, row in df.iterrows():
-                if pd.isna(row['Product Price']) or pd.isna(row['Product Price After IVU']) or pd.isna(row['IVU Tax']):
-                    fair_market_value_raw = row['Fair Market Value']
-                    fair_market_value = Decimal(currency_to_float(fair_market_value_raw))
-                    regular_product_price, total_price, IVU_tax, price_discount = self.rpc_formula(fair_market_value)
-                    
-                    # Calculate the discounted prices using Decimal
-                    product_price_after_discount = (regular_product_price - price_discount).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-                    ivu_tax_after_discount = (product_price_after_discount * Decimal('0.115')).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-                    product_price_plus_ivu_discount = (product_price_after_discount + ivu_tax_after_discount).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-
-                    df.at[index, 'Product Price'] = float(regular_product_price)
-                    df.at[index, 'Product Price After IVU'] = float(total_price)
-                    df.at[index, 'IVU Tax'] = float(IVU_tax)
-                    df.at[index, 'Discount'] = float(price_discount)
-                    df.at[index, 'Discount Percentage'] = 10  # Assuming a fixed 10% discount
-                    df.at[index, 'Product Price After Discount'] = float(product_price_after_discount)
-                    df.at[index, 'IVU Tax After Discount'] = float(ivu_tax_after_discount)
-                    df.at[index, 'Product Price After IVU and Discount'] = float(product_price_plus_ivu_discount)
-
-            # Clear the existing data in the sheet starting from the first row of actual data
-            for row in sheet.iter_rows(min_row=n_initial_empty_rows + 1, max_col=sheet.max_column, max_row=sheet.max_row):
-                for cell in row:
-                    cell.value = None
-
-            # Write the updated DataFrame back to the sheet
-            # Start enumeration based on where actual data begins in the Excel sheet
-            for r_idx, df_row in enumerate(dataframe_to_rows(df, index=False, header=False), start=n_initial_empty_rows + 1):
-                for c_idx, value in enumerate(df_row, start=1):
-                    sheet.cell(row=r_idx, column=c_idx, value=value)
+            def exact_cents(value):
+                # The value in cents when the batch kernel prices it exactly like rpc_formula, otherwise None
+                if isinstance(value, bool) or not isinstance(value, (int, float, np.integer, np.floating)):
+                    return None
+                value = float(value)
+                if not math.isfinite(value):
+                    return None
+                cents = round(value * 100)
+                if not 0 <= cents < PRICE_KERNEL_MAX_CENTS or cents / 100 != value:
+                    return None
+                return cents
+
+            # Rows missing any of their prices get every price column recalculated
+            missing = df['Product Price'].isna() | df['Product Price After IVU'].isna() | df['IVU Tax'].isna()
+            fair_market_values = df.loc[missing, 'Fair Market Value'].map(currency_to_float)
+            fair_market_cents = fair_market_values.map(exact_cents)
+            batch_rows = fair_market_cents.notna()
+
+            # Whole-cent, non-negative values are priced at once on int64 cent arrays
+            price_columns = ['Product Price', 'Product Price After IVU', 'IVU Tax', 'Discount', 'Product Price After Discount',
+                             'IVU Tax After Discount', 'Product Price After IVU and Discount']
+            if batch_rows.any():
+                batch_index = fair_market_cents.index[batch_rows]
+                prices = self.rpc_formula_cents(fair_market_cents[batch_rows].astype(np.int64).to_numpy())
+                for column, cents in zip(price_columns, prices):
+                    df.loc[batch_index, column] = (cents / 100).tolist()
+                df.loc[batch_index, 'Discount Percentage'] = 10  # Assuming a fixed 10% discount
+
+            # Anything else (fractions of a cent, negative values, text) goes through rpc_formula
+            for index in fair_market_values.index[~batch_rows]:
+                fair_market_value = Decimal(fair_market_values[index])
+                regular_product_price, total_price, IVU_tax, price_discount = self.rpc_formula(fair_market_value)
+                
+                # Calculate the discounted prices using Decimal
+                product_price_after_discount = (regular_product_price - price_discount).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+                ivu_tax_after_discount = (product_price_after_discount * Decimal('0.115')).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+                product_price_plus_ivu_discount = (product_price_after_discount + ivu_tax_after_discount).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+                df.at[index, 'Product Price'] = float(regular_product_price)
+                df.at[index, 'Product Price After IVU'] = float(total_price)
+                df.at[index, 'IVU Tax'] = float(IVU_tax)
+                df.at[index, 'Discount'] = float(price_discount)
+                df.at[index, 'Discount Percentage'] = 10  # Assuming a fixed 10% discount
+                df.at[index, 'Product Price After Discount'] = float(product_price_after_discount)
+                df.at[index, 'IVU Tax After Discount'] = float(ivu_tax_after_discount)
+                df.at[index, 'Product Price After IVU and Discount'] = float(product_price_plus_ivu_discount)
+            self.logger.info(f"Calculated prices for {int(missing.sum())} products, {int(batch_rows.sum())} of them in one batch")
+
+            # Write back only the recalculated cells whose value changed, the rest of the sheet 
+            # (formatting and hyperlinks included) is left untouched
+            layout = self.excel_manager.get_sheet_layout(sheet, excel_path)
+            written_columns = {}
+            for column in price_columns + ['Discount Percentage']:
+                if column in layout['columns']:
+                    written_columns[column] = layout['columns'][column]
+                else:
+                    self.logger.error(f"Column '{column}' not found in the sheet, its prices weren't written")
+
+            changed_cells = 0
+            for position in df.index.get_indexer(missing.index[missing]):
+                sheet_row = position + n_initial_empty_rows + 1  # Data starts on the row after the header
+                for column, column_index in written_columns.items():
+                    value = df.iat[position, df.columns.get_loc(column)]
+                    cell = sheet.cell(row=sheet_row, column=column_index)
+                    if cell.value != value:
+                        cell.value = value
+                        changed_cells += 1
+            self.logger.info(f"Wrote {changed_cells} changed price cells")
 
             # Save the workbook
             workbook.save(excel_path)
-            messagebox.showinfo("Success", "Prices updated successfully in the Excel file.")
-            self.logger.info("Prices updated successfully in the Excel file")
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred while updating prices: {e}")
-            # Log the error encountered during the price update process
-            self.logger.error(f"Error updating prices in Excel: {e}")
+        self.logger.info("Prices updated successfully in the Excel file")
 
 
     def backup_excel_database(self):
@@ -3703,6 +5673,102 @@ class Application(tk.Frame):
             # Log any errors encountered during the closure
             self.logger.error(f"Error occurred while closing database connection: {e}")
 
+def product_document_values(product_id, product_info):
+    """
+    Formats the fields written to a product's Word document from its record in the products table.
+    """
+    def safe_format_currency(value):
+        try:
+            return f"${float(value):.2f}" if value is not None else "N/A"
+        except ValueError:
+            return str(value)
+
+    def safe_format_percentage(value):
+        try:
+            return f"{float(value)}%" if value is not None else "N/A"
+        except ValueError:
+            return str(value)
+
+    def get_field(column):
+        return product_info.get(column, "N/A") if product_info else "N/A"
+
+    product_name = get_field('Product Name')
+
+    # Retrieve the product description
+    product_description = get_field('Product Description')
+    if product_description == "N/A" or pd.isna(product_description):
+        product_description = "No Product Description At The Moment"
+
+    # Retrieve the comments
+    comments = get_field('Comments')
+    if comments == "N/A" or pd.isna(comments):
+        comments = "No Comments Found"
+
+    # Convert all values to strings with appropriate formatting
+    return {
+        'Product ID': str(product_id),
+        'Product Name': str(product_name) if product_name is not None else "N/A",
+        'Product Price': safe_format_currency(get_field('Product Price')),
+        'IVU Tax': safe_format_currency(get_field('IVU Tax')),
+        'Product Price After IVU': safe_format_currency(get_field('Product Price After IVU')),
+        'Discount': safe_format_currency(get_field('Discount')),
+        'Discount Percentage': safe_format_percentage(get_field('Discount Percentage')),
+        'Product Description': str(product_description),
+        'Comments': str(comments),
+    }
+
+def write_product_document(doc_path, values):
+    """
+    Builds a product's Word document from the values of product_document_values and saves it at doc_path.
+    """
+    def add_styled_paragraph(doc, text, variable_text):
+        p = doc.add_paragraph()
+        run = p.add_run(text)
+        run.bold = True
+        run.italic = True
+        run.underline = True
+        run.font.highlight_color = WD_COLOR_INDEX.BRIGHT_GREEN  # Applying light green highlight
+        run.font.size = Pt(12)  # Setting font size to 12
+        p.add_run(variable_text)
+
+    # Create a new Word document
+    doc = Document()
+
+    # Adding styled paragraphs with specified font size
+    add_styled_paragraph(doc, "Product ID: ", values['Product ID'])
+    add_styled_paragraph(doc, "Product Name: ", values['Product Name'])
+    doc.add_paragraph("")  # Empty line
+    add_styled_paragraph(doc, "Product Price: ", values['Product Price'])
+    add_styled_paragraph(doc, "IVU Tax: ", values['IVU Tax'])
+    add_styled_paragraph(doc, "Product Price After IVU (Sale Price): ", values['Product Price After IVU'])
+    add_styled_paragraph(doc, "Reseller Earnings : ", f"{values['Discount']}     [ = {values['Discount Percentage']} of {values['Product Price']} (Product Price)]")
+    doc.add_paragraph("")  # Empty line
+    add_styled_paragraph(doc, "Product Description:", "")
+    doc.add_paragraph(values['Product Description'])
+    doc.add_paragraph("")  # Empty line
+    add_styled_paragraph(doc, "Comments:", "")
+    doc.add_paragraph(values['Comments'])
+
+    # Uncomment the next line if you want to include the order link
+    # add_styled_paragraph(doc, "Amazon Link (to get the product description and pictures, if needed): ", order_link)
+
+    # Save the document
+    doc.save(doc_path)
+
+def write_product_documents(jobs):
+    """
+    Process pool entry point of create_all_word_docs. Writes every (item id, document path, values) 
+    job and returns (item id, error message or None) for each of them.
+    """
+    results = []
+    for iid, doc_path, values in jobs:
+        try:
+            write_product_document(doc_path, values)
+            results.append((iid, None))
+        except Exception as e:
+            results.append((iid, str(e)))
+    return results
+
 def data_spacing_control():
     def prevent_data_overlap():
         """Ensure data separation and prevent overlap in display."""
@@ -3780,6 +5846,10 @@ def main():
 def on_close(app, root):
     
     app.logger.info("Closing the application and attempting to backup the database.")
+    try:
+        app.flush_edit_journal()  # Write pending edits before backing up the workbook
+    except Exception as e:
+        app.logger.error(f"Error flushing journaled edits on close, they will be replayed on next start: {e}")
     if hasattr(app, 'excel_manager') and app.excel_manager.filepath:
         app.logger.info(f"Excel file path at time of backup: {app.excel_manager.filepath}")
         try:
@@ -3790,9 +5860,19 @@ def on_close(app, root):
     else:
         app.logger.error("Excel manager not set or no filepath available.")
     app.running = False
+    app.logger.info(f"Image cache statistics: {app.image_cache.stats()}")
+    app.image_executor.shutdown(wait=False, cancel_futures=True)  # Queued image loads are dropped
+    if app.prefetch_future is not None:
+        app.prefetch_future.cancel()  # Only the latest prefetch can still be queued
+    app.prefetch_executor.submit(app.close_prefetch_connection)
+    app.prefetch_executor.shutdown(wait=False)
+    if app.word_doc_executor is not None:
+        # Documents that are being written are finished, the chunks that haven't started are dropped
+        app.word_doc_executor.shutdown(wait=False, cancel_futures=True)
     root.destroy()  # Call the destroy method to close the application
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # Lets the Word document processes start from a packaged executable
     data_spacing_control_thread = threading.Thread(target=data_spacing_control)
     data_spacing_control_thread.start()
 
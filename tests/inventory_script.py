@@ -0,0 +1,70 @@
+"""
+Imports 'Inventory Management.py' for the tests. The GUI and document libraries it imports are 
+replaced with empty stand-ins when they aren't installed, so its non-GUI code can be tested 
+without a display or the full set of dependencies.
+"""
+import ast
+import importlib
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+SCRIPT_PATH = Path(__file__).resolve().parent.parent / 'Inventory Management.py'
+MODULE_NAME = 'inventory_management'
+# What the tested code actually runs on, the tests are skipped without these
+REQUIRED_MODULES = ('numpy', 'pandas')
+
+
+def stub_module(name):
+    """
+    Returns an empty module whose missing attributes are placeholder classes, so 
+    'from module import Name' and subclassing module.Name work at import time.
+    """
+    module = types.ModuleType(name)
+    module.__path__ = []  # Lets stubbed submodules be imported from it
+
+    def placeholder(attribute):
+        if attribute.startswith('__'):
+            raise AttributeError(attribute)
+        return type(attribute, (), {})
+
+    module.__getattr__ = placeholder
+    return module
+
+
+def install_stubs(module_names):
+    for name in module_names:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            parts = name.split('.')
+            for depth in range(1, len(parts) + 1):
+                sys.modules.setdefault('.'.join(parts[:depth]), stub_module('.'.join(parts[:depth])))
+
+
+def load_inventory_management():
+    """
+    Returns the script as a module, imported once per test session.
+    """
+    for module_name in REQUIRED_MODULES:
+        pytest.importorskip(module_name)
+    if MODULE_NAME in sys.modules:
+        return sys.modules[MODULE_NAME]
+
+    tree = ast.parse(SCRIPT_PATH.read_text(encoding='utf-8'))
+    imported = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            imported += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            imported.append(node.module)
+    install_stubs(imported)
+
+    spec = importlib.util.spec_from_file_location(MODULE_NAME, SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[MODULE_NAME] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,61 @@
+"""
+Checks that DatabaseManager.get_products_to_sell returns the right products through the 
+idx_products_for_sale partial index instead of walking the whole products table.
+"""
+from datetime import date
+
+import pytest
+
+from inventory_script import load_inventory_management
+
+inventory_management = load_inventory_management()
+pd = inventory_management.pd
+
+PRODUCT_COUNT = 8000
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    db_manager = inventory_management.DatabaseManager(str(tmp_path / 'inventory_management.db'))
+    products = pd.DataFrame({
+        'Product ID': [f"P{number:05d}" for number in range(PRODUCT_COUNT)],
+        'Product Name': [f"Product {number}" for number in range(PRODUCT_COUNT)],
+        'Sold': ['YES' if number % 4 == 0 else None for number in range(PRODUCT_COUNT)],
+        'Damaged': ['YES' if number % 7 == 0 else 'NO' for number in range(PRODUCT_COUNT)],
+        'Personal': ['YES' if number % 11 == 0 else None for number in range(PRODUCT_COUNT)],
+        'Cancelled Order': ['YES' if number % 13 == 0 else None for number in range(PRODUCT_COUNT)],
+        'To Sell After': [f"2024-{number % 12 + 1:02d}-15" for number in range(PRODUCT_COUNT)],
+    })
+    db_manager.sync_products(('workbook.xlsx', 1, 1, 'Sheet1'), products)
+    db_manager.cur.execute('ANALYZE')
+    yield db_manager
+    db_manager.conn.close()
+
+
+def expected_product_ids(as_of):
+    return [f"P{number:05d}" for number in range(PRODUCT_COUNT)
+            if number % 4 and number % 7 and number % 11 and number % 13 and number % 12 + 1 <= as_of.month]
+
+
+def test_products_to_sell(db_manager):
+    as_of = date(2024, 6, 30)
+    records = db_manager.get_products_to_sell(as_of)
+    assert [record['Product ID'] for record in records] == expected_product_ids(as_of)
+
+
+def test_products_to_sell_use_partial_index(db_manager):
+    statements = []
+    db_manager.conn.set_trace_callback(statements.append)
+    db_manager.get_products_to_sell(date(2024, 6, 30))
+    db_manager.conn.set_trace_callback(None)
+
+    query = next(statement for statement in statements if 'FROM products' in statement)
+    plan = [row[3] for row in db_manager.cur.execute(f"EXPLAIN QUERY PLAN {query}")]
+    assert any('USING INDEX idx_products_for_sale' in detail for detail in plan), plan
+    assert not any(detail.startswith('SCAN products') for detail in plan), plan
+
+
+def test_old_to_sell_after_index_is_dropped(db_manager):
+    indexes = {row[0] for row in db_manager.cur.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert 'idx_products_to_sell_after' not in indexes
+    assert 'idx_products_for_sale' in indexes
@@ -0,0 +1,68 @@
+"""
+Checks that the batch price kernel (Application.rpc_formula_cents) prices every fair market value 
+exactly like rpc_formula and the Decimal discount math in update_prices.
+"""
+import logging
+import random
+import types
+from decimal import Decimal, ROUND_HALF_UP
+
+from inventory_script import load_inventory_management
+
+inventory_management = load_inventory_management()
+Application = inventory_management.Application
+np = inventory_management.np
+
+EVERY_CENT_UP_TO = 400000  # $4,000.00
+RANDOM_VALUES = 20000
+
+
+def decimal_prices(fair_market_value):
+    """
+    The seven price columns as update_prices calculates them with Decimal, in cents.
+    """
+    app = types.SimpleNamespace(logger=logging.getLogger('test_rpc_formula_cents'))
+    regular_product_price, total_price, IVU_tax, price_discount = Application.rpc_formula(app, fair_market_value)
+    product_price_after_discount = (regular_product_price - price_discount).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    ivu_tax_after_discount = (product_price_after_discount * Decimal('0.115')).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    product_price_plus_ivu_discount = (product_price_after_discount + ivu_tax_after_discount).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    prices = (regular_product_price, total_price, IVU_tax, price_discount,
+              product_price_after_discount, ivu_tax_after_discount, product_price_plus_ivu_discount)
+    return tuple(int(price * 100) for price in prices)
+
+
+def sheet_cents(cents):
+    """
+    Whether update_prices prices the float value of these cents with the kernel (its exact_cents check).
+    """
+    value = cents / 100
+    return round(value * 100) == cents
+
+
+def assert_kernel_matches(cents_values):
+    kernel_prices = Application.rpc_formula_cents(np.array(cents_values, dtype=np.int64))
+    assert len(kernel_prices) == 7
+    for position, cents in enumerate(cents_values):
+        # update_prices hands rpc_formula the sheet's float value
+        expected = decimal_prices(Decimal(cents / 100))
+        actual = tuple(int(column[position]) for column in kernel_prices)
+        assert actual == expected, f"Fair market value {cents / 100}: {actual} != {expected}"
+
+
+def test_every_cent():
+    assert_kernel_matches(list(range(EVERY_CENT_UP_TO + 1)))
+
+
+def test_random_values():
+    generator = random.Random(20240601)
+    limit = inventory_management.PRICE_KERNEL_MAX_CENTS
+    # Spread over every order of magnitude the kernel accepts
+    cents_values = [generator.randrange(10 ** generator.randint(1, 12)) for _ in range(RANDOM_VALUES)]
+    cents_values += [limit - 1, limit - 500, limit - 501]
+    cents_values = [cents for cents in cents_values if sheet_cents(cents)]
+    assert all(0 <= cents < limit for cents in cents_values)
+    assert_kernel_matches(cents_values)
+
+
+def test_empty_batch():
+    assert all(len(column) == 0 for column in Application.rpc_formula_cents(np.array([], dtype=np.int64)))